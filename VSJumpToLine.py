@@ -31,13 +31,40 @@ SOFTWARE.
 """
 import sys
 import os
-import logging
-import threading
 import getopt
 import time
 import re
-import glob
 import enum
+import array
+import codecs
+import locale
+# Further modules are imported where the feature which needs them is used (faster start for small logs):
+# logging, threading, glob, json, hashlib, tempfile, mmap, concurrent.futures, functools, multiprocessing
+
+_logger = None
+_log_format = ""    # set by main(), the log output of the library API is configured by the application
+
+def log():
+    """
+    Return the logger of VSJumpToLine, logging is imported on first use.
+    On the command line the log output is configured then too.
+    """
+    global _logger
+    if _logger is None:
+        import logging
+        _logger = logging.getLogger("VSJumpToLine")
+        if _log_format:
+            logging.basicConfig(format=_log_format)
+            # The debug output is only logged with the debug option (checked before each call)
+            _logger.setLevel(logging.DEBUG)
+    return _logger
+
+def _init_worker(log_format):
+    """
+    Initializer of the worker processes of the jobs option, they log like the process which started them.
+    """
+    global _log_format
+    _log_format = log_format
 
 class FormatSize:
     """
@@ -69,15 +96,15 @@ class FormatSize:
         else:
             return False
 
-class PleaseWait(threading.Thread):
+class PleaseWait:
     """
     Simple implementation of a progress bar to indicate to the user that the progress continues.
     """
-    # An event that tells the thread to stop
-    stopper = threading.Event()
     dot = 0
     def __init__(self):
-        super().__init__()
+        # threading is only needed (and imported) if the progress is shown
+        self.thread = None
+        self.stopper = None
 
     def run(self):
         time.sleep(0.2)
@@ -91,18 +118,142 @@ class PleaseWait(threading.Thread):
         """
         Turn progress on
         """
-        self.daemon = True
-        self.start()
+        import threading
+        # An event that tells the thread to stop
+        self.stopper = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
 
     def please_wait_off(self):
         """
         Turn progress off
         """
+        if self.thread is None:
+            return
         self.stopper.set()
         if self.dot:
             sys.stdout.write("\n")
         sys.stdout.flush()
 
+class FileIndex:
+    """
+    Index of all file names below a root directory (file name -> list of paths).
+    The directory tree is walked only once, afterwards each lookup is a dictionary access.
+
+    Optionally the index is stored in a cache file (keyed by the absolute root path) together with
+    the modification time of every directory. On the next run only directories whose modification
+    time has changed are scanned again.
+    """
+    cache_version = 1
+
+    def __init__(self, root, cache_file="", debug=0):
+        self.root = root
+        self.cache_file = cache_file
+        self.debug = debug
+        self.files = {}
+        self.directories = {}           # relative directory -> [mtime_ns, entry names, subdirectory names]
+        self.cnt_scanned_dirs = 0
+        self.cnt_cached_dirs = 0
+
+        self.cache_roots = self._load_cache()  # absolute root -> directories, of all roots in the cache file
+        cached_directories = self.cache_roots.get(os.path.abspath(self.root), {})
+        self._scan("", cached_directories)
+        self._save_cache(cached_directories)
+
+    def _load_cache(self):
+        """
+        Load the directories of the cache file, an unreadable or outdated cache file is ignored.
+        """
+        if not self.cache_file:
+            return {}
+        import json
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as file_cache:
+                data = json.load(file_cache)
+            if data.get("version") == self.cache_version:
+                return data["roots"]
+        except (OSError, ValueError, KeyError, AttributeError) as err:
+            if self.debug:
+                log().info("index cache: <%s> not used: %s", self.cache_file, err)
+        return {}
+
+    def _save_cache(self, cached_directories):
+        """
+        Store the directories in the cache file, other roots in the cache file are kept.
+        The cache file is only written if a directory has been scanned again or has been removed.
+        """
+        if not self.cache_file:
+            return
+        if not self.cnt_scanned_dirs and len(self.directories) == len(cached_directories):
+            return
+        import json
+        roots = self.cache_roots
+        roots[os.path.abspath(self.root)] = self.directories
+        cache_file_tmp = "{}.{}.tmp".format(self.cache_file, os.getpid())
+        try:
+            with open(cache_file_tmp, "w", encoding="utf-8") as file_cache:
+                json.dump({"version": self.cache_version, "roots": roots}, file_cache)
+            os.replace(cache_file_tmp, self.cache_file)
+        except OSError as err:
+            log().warning("index cache: <%s> not written: %s", self.cache_file, err)
+
+    def _scan(self, relative, cached_directories):
+        """
+        Walk the directory tree in the same order as a recursive glob ('root/**/name') would do,
+        hidden directories are skipped. Unchanged directories are taken from the cache.
+        """
+        directory = os.path.join(self.root, relative)
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return
+
+        cached = cached_directories.get(relative)
+        if cached and cached[0] == mtime:
+            self.cnt_cached_dirs += 1
+            names, subdirectories = cached[1], cached[2]
+        else:
+            self.cnt_scanned_dirs += 1
+            names, subdirectories = [], []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        names.append(entry.name)
+                        try:
+                            if entry.is_dir() and not entry.name.startswith('.'):
+                                subdirectories.append(entry.name)
+                        except OSError:
+                            pass
+            except OSError:
+                return
+
+        self.directories[relative] = [mtime, names, subdirectories]
+        for name in names:
+            self.files.setdefault(os.path.normcase(name), []).append(os.path.join(directory, name))
+        for subdirectory in subdirectories:
+            self._scan(os.path.join(relative, subdirectory), cached_directories)
+
+    def refresh(self):
+        """
+        Update the index, only directories whose modification time has changed are scanned again.
+        """
+        cached_directories = self.directories
+        self.files = {}
+        self.directories = {}
+        self.cnt_scanned_dirs = 0
+        self.cnt_cached_dirs = 0
+        self._scan("", cached_directories)
+        self._save_cache(cached_directories)
+
+    def lookup(self, name):
+        """
+        Return the first path of a file name or an empty string if the file name is unknown.
+        """
+        paths = self.files.get(os.path.normcase(name))
+        if paths:
+            return paths[0]
+        return ""
+
 class Severity(enum.IntEnum):
     """
     Severities enumeration
@@ -116,6 +267,609 @@ class Severity(enum.IntEnum):
     warning = 30
     error = 40
 
+# Severity tokens (lowercase) and the corresponding severity, matched on the undecoded lines
+SEVERITY_TOKENS = {
+    b'note:': Severity.note,                 # GCC, Doxygen
+    b'note[': Severity.note,                 # IAR
+    b'info:': Severity.note,                 # PC-Lint
+    b'info[': Severity.note,                 # PC-Lint
+    b'warning:': Severity.warning,           # GCC, Doxygen, cmocka
+    b'warning[': Severity.warning,           # IAR, BullseyeCoverage
+    b':fail:': Severity.warning,             # Unity test framework
+    b'error:': Severity.error,               # GCC, Doxygen, cmocka
+    b'error[': Severity.error,               # IAR
+    b'undefined reference': Severity.error,  # GCC
+}
+def _severity_filter(tokens):
+    """
+    Return the pattern matching any of the tokens, tokens which only differ in the last character are
+    combined ('note[:\\[]'), which makes the search faster than a plain alternation of the tokens.
+    """
+    endings = {}
+    for token in tokens:
+        endings.setdefault(token[:-1], []).append(re.escape(token[-1:]))
+    return b"|".join(re.escape(prefix) + (ends[0] if len(ends) == 1 else b"[" + b"".join(ends) + b"]")
+                     for prefix, ends in endings.items())
+
+# Fast check if a line contains any severity token at all
+REGEX_SEVERITY_FILTER = re.compile(_severity_filter(SEVERITY_TOKENS))
+# All (also overlapping) severity tokens of a line
+REGEX_SEVERITY_TOKENS = re.compile(b"(?=(" + b"|".join(re.escape(token) for token in SEVERITY_TOKENS) + b"))")
+# Line number and/or column (GCC/doxygen/cmocka | BullseyeCoverage | IAR)
+REGEX_LINE_COLUMN = re.compile(r":(\d+):((\d+):)?|(\"(.+)\",(\d+))|(\((\d+)\) :)")
+# cmocka (unit testing framework for C)
+REGEX_SPECIAL_CMOCKA = re.compile(r"^\[   LINE   \] --- (.+)")
+# Filename (without path) followed by the line number in Visual Studio format
+REGEX_FILENAME_LOCATION = re.compile(r"((^.+)\.(.+))(\(.+\)):")
+# Line before a message, currently only implemented for GCC (matched on the undecoded lines)
+REGEX_IN_FUNCTION = re.compile(rb": In function.+:", re.IGNORECASE)
+# Wildcards of an input file name (same check as glob.has_magic, glob is only imported if needed)
+REGEX_GLOB_MAGIC = re.compile(r"[*?[]")
+
+class Record(enum.IntEnum):
+    """
+    Record types returned by the line parser
+    """
+    message = 0     # (Record.message, severity, processed line, line before, severity of the result is used, line number, tool, location)
+                    # location: (file, line, column, start of the message in the processed line), None if not converted
+    context = 1     # (Record.context, line) possible multi line context (look behind)
+    reset = 2       # (Record.reset,) line without severity, ends the multi line context
+
+class Stats:
+    """
+    Time per phase and number of calls for the stats option.
+    The time of a phase excludes the time of the phases called by it.
+    """
+    phases = ("read/decode", "classification", "location rewrite", "path resolution", "dedupe", "output")
+
+    def __init__(self):
+        self.times = dict.fromkeys(self.phases, 0.0)
+        self.calls = dict.fromkeys(self.phases, 0)
+        self.nested = 0.0       # time of the nested phases of the running call
+
+    def timed(self, function, phase, count=True):
+        """
+        Return a wrapper of the function which adds its time and calls (if counted) to the phase.
+        """
+        def wrapper(*args):
+            outer = self.nested
+            self.nested = 0.0
+            start = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.times[phase] += elapsed - self.nested
+                if count:
+                    self.calls[phase] += 1
+                self.nested = outer + elapsed
+        return wrapper
+
+    def timed_iter(self, iterable, phase):
+        """
+        Return a generator of the items of the iterable which adds the time of each step to the phase.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.times[phase] += time.perf_counter() - start
+                return
+            self.times[phase] += time.perf_counter() - start
+            yield item
+
+    def merge(self, other):
+        """
+        Add the times and calls of other stats (of a worker process).
+        """
+        for phase in self.phases:
+            self.times[phase] += other.times[phase]
+            self.calls[phase] += other.calls[phase]
+
+def lookup_encoding(name):
+    """
+    Return the normalized name of an encoding of the tool output, raise LookupError if it is unknown.
+    The lines are split and classified undecoded, so the encoding has to be ASCII compatible (not e.g. UTF-16).
+    """
+    encoding = codecs.lookup(name).name
+    sample = bytes(range(128))
+    try:
+        compatible = sample.decode(encoding) == sample.decode("ascii")
+    except (UnicodeDecodeError, LookupError):
+        compatible = False
+    if not compatible:
+        raise LookupError("only ASCII compatible encodings are supported")
+    return encoding
+
+class LineParser:
+    """
+    Classifies the lines of the tool output and converts them into the Visual Studio format.
+    The parser keeps no state from line to line (except the line counter), the multi line context is resolved
+    by the consumer of the records. So independent parts of a file can be parsed in parallel.
+    """
+    chunk_size = 1024 * 1024    # read size for the tool output
+
+    def __init__(self, multi_line=0, encoding="utf-8", debug=0, stats=None):
+        self.multi_line = multi_line
+        self.encoding = encoding
+        # Checked before each log call of the hot path, so the log arguments are not even built without debug option
+        self.debug = debug
+        self.cnt_lines = 0
+        # Only with stats option the phases are timed, otherwise the methods are called directly
+        self.stats = stats
+        if stats:
+            self.decode = stats.timed(self.decode, "read/decode")
+            self.match_severity = stats.timed(self.match_severity, "classification")
+            self.match_line_and_column = stats.timed(self.match_line_and_column, "location rewrite")
+            self.match_special = stats.timed(self.match_special, "location rewrite")
+
+    def read_lines(self, file_binary, limit=None, digest=None):
+        """
+        Read the tool output in large chunks and split it into lines (bytes without line endings).
+        read1() returns what is available, so lines from a pipe are processed as soon as they arrive.
+        Optionally only 'limit' bytes are read and the read data is added to a hash object ('digest').
+        """
+        rest = b""
+        while True:
+            if limit is None:
+                chunk = file_binary.read1(self.chunk_size)
+            else:
+                chunk = file_binary.read1(min(self.chunk_size, limit))
+                limit -= len(chunk)
+            if not chunk:
+                break
+            if digest is not None:
+                digest.update(chunk)
+            lines = (rest + chunk).replace(b"\r", b"").split(b"\n")
+            rest = lines.pop()
+            yield from lines
+        if rest:
+            yield rest
+
+    def follow_lines(self, file_binary, poll_interval):
+        """
+        Like read_lines(), but at the end of the file wait for appended data (like 'tail -f') until interrupted.
+        An incomplete last line is kept until its line end has been written. If the file gets truncated
+        (e.g. the tool output is written again) it is read from the beginning.
+        """
+        rest = b""
+        while True:
+            chunk = file_binary.read1(self.chunk_size)
+            if not chunk:
+                if os.fstat(file_binary.fileno()).st_size < file_binary.tell():
+                    file_binary.seek(0)
+                    rest = b""
+                else:
+                    time.sleep(poll_interval)
+                continue
+            lines = (rest + chunk).replace(b"\r", b"").split(b"\n")
+            rest = lines.pop()
+            yield from lines
+
+    def read_buffer_lines(self, buffer, continue_context=False):
+        """
+        Search the tool output in a buffer (memory mapped file or bytes) chunk by chunk for severity tokens
+        and return only the lines containing a token plus the following lines which may be multi line context
+        (starting with a space, up to the first line which is no context). All other lines would be ignored
+        anyway, they are only counted.
+        With 'continue_context' the first line is returned too (context of the line before the buffer).
+        """
+        size = len(buffer)
+        chunk_start = 0
+        while chunk_start < size:
+            # Chunks end at a line end
+            chunk_end = buffer.find(b"\n", min(chunk_start + self.chunk_size, size - 1))
+            chunk_end = size if chunk_end == -1 else chunk_end + 1
+            chunk = buffer[chunk_start:chunk_end]
+            chunk_start = chunk_end
+
+            # Start of all lines containing a severity token
+            chunk_lower = chunk.lower()
+            line_starts = set()
+            for token in SEVERITY_TOKENS:
+                pos = chunk_lower.find(token)
+                while pos > -1:
+                    line_starts.add(chunk_lower.rfind(b"\n", 0, pos) + 1)
+                    pos = chunk_lower.find(b"\n", pos)
+                    if pos > -1:
+                        pos = chunk_lower.find(token, pos)
+            # The first line may be the context of the last line of the previous chunk
+            if continue_context:
+                line_starts.add(0)
+
+            cnt_yielded = 0
+            line_end = 0
+            for line_start in sorted(line_starts):
+                # Already returned as context line
+                if line_start < line_end:
+                    continue
+                # The skipped lines only count (before the line is returned, so the line numbers are right)
+                self.cnt_lines += chunk.count(b"\n", line_end, line_start)
+                line, line_end = self._buffer_line(chunk, line_start)
+                cnt_yielded += 1
+                yield line
+                # For multi line option (look behind), the first line which is no context ends the context
+                while self.multi_line and line_end < len(chunk):
+                    context_start = line_end
+                    line, line_end = self._buffer_line(chunk, context_start)
+                    cnt_yielded += 1
+                    yield line
+                    if context_start not in line_starts and (not line.startswith(b" ") or line.isspace()):
+                        break
+            continue_context = bool(self.multi_line and cnt_yielded and line_end == len(chunk))
+
+            # The skipped lines at the end of the chunk
+            if line_end < len(chunk):
+                self.cnt_lines += chunk.count(b"\n", line_end)
+                if not chunk.endswith(b"\n"):
+                    self.cnt_lines += 1
+
+    def _buffer_line(self, chunk, line_start):
+        """
+        Return the line (without line ending) starting at a position of a chunk and the start of the next line.
+        """
+        line_end = chunk.find(b"\n", line_start)
+        line_end = len(chunk) if line_end == -1 else line_end + 1
+        return chunk[line_start:line_end].replace(b"\r", b"").replace(b"\n", b""), line_end
+
+    def decode(self, line):
+        """
+        Decode a line of the tool output, invalid bytes are replaced.
+        """
+        return line.decode(self.encoding, "replace")
+
+    def parse(self, lines):
+        """
+        Parse the lines of the tool output and return the records.
+        The lines are classified undecoded, only lines which may be added to the results are decoded.
+        """
+        if self.stats:
+            lines = self.stats.timed_iter(lines, "read/decode")
+        # The line before may be followed by multi line context
+        context_possible = True
+        for raw_line in lines:
+            self.cnt_lines += 1
+
+            severity = self.match_severity(raw_line)
+            if severity == Severity.ignore:
+                # For multi line option (look behind)
+                if not self.multi_line:
+                    continue
+                if context_possible and raw_line.startswith(b" ") and not raw_line.isspace():
+                    yield (Record.context, self.decode(raw_line))
+                elif context_possible:
+                    context_possible = False
+                    yield (Record.reset,)
+                continue
+
+            context_possible = True
+            file_line = self.decode(raw_line)
+
+            # Match line before, currently only implemented for GCC
+            if REGEX_IN_FUNCTION.search(raw_line):
+                line_before = file_line
+            else:
+                line_before = ""
+
+            # Line number and/or column should always match
+            line_processed_line_column, tool, location = self.match_line_and_column(file_line)
+            # Go into depth
+            if line_processed_line_column:
+                line_processed_special = self.match_special(line_processed_line_column)
+                if line_processed_special:
+                    # The cmocka prefix is removed from the file
+                    cnt_removed = len(line_processed_line_column) - len(line_processed_special)
+                    location = (location[0][cnt_removed:], location[1], location[2], location[3] - cnt_removed)
+                    yield (Record.message, severity, line_processed_special, line_before, True, self.cnt_lines, "cmocka", location)
+                else:
+                    yield (Record.message, severity, line_processed_line_column, line_before, True, self.cnt_lines, tool, location)
+            else:
+                # Already in Visual Studio format or something new that is not yet covered
+                if self.debug:
+                    log().info("no match for line: %s", file_line)
+                yield (Record.message, severity, file_line, line_before, False, self.cnt_lines, "", None)
+
+    def match_severity(self, line):
+        """
+        Determine the severity of a particular (undecoded) line.
+        The line is lowercased only once and the severity tokens are matched in a single pass,
+        the severity with the highest priority wins (note before warning before error).
+        """
+        line = line.lower()
+        if not REGEX_SEVERITY_FILTER.search(line):
+            return Severity.ignore
+        return min(SEVERITY_TOKENS[token] for token in REGEX_SEVERITY_TOKENS.findall(line))
+
+    def match_line_and_column(self, line):
+        """
+        Try to match only line number and/or column.
+        Return the line, the tool (format) which has been matched and the location (file, line, column,
+        start of the message in the line), an empty line if nothing matched.
+
+        GCC/doxygen/cmocka
+        'src/test/testfile.c:124:43: warning: unused parameter 'state' [-Wunused-parameter]'
+        'src/test/testfile.c:124: warning: unused parameter 'state' [-Wunused-parameter]'
+        '[   LINE   ] --- testcases.c:9: error: Failure!'
+
+        BullseyeCoverage
+        '"c:/testfile.c",276  Warning[Pe177]: ...'
+
+        IAR Embedded Workbench
+        'c:\test\testfile.h(43) : Warning[Pe1105]: ...'
+        """
+
+        res = REGEX_LINE_COLUMN.search(line)
+        if self.debug:
+            log().debug("%s groups: %s", res, res.groups() if res else None)
+        if res:
+            file = line[:res.start()]
+            column = 0
+            # ':124:43:'
+            if res.group(1) and res.group(2):
+                line_number, column = int(res.group(1)), int(res.group(3))
+                location = "({},{}):".format(res.group(1), res.group(3))
+                tool = "gcc"
+            # ':124:'
+            elif res.group(1):
+                line_number = int(res.group(1))
+                location = "({}):".format(res.group(1))
+                tool = "gcc"
+            # '"c:/test.c",276'
+            elif res.group(4):
+                file += res.group(5)
+                line_number = int(res.group(6))
+                location = "({}):".format(res.group(6))
+                tool = "bullseye"
+            # 'c:\test\testfile.h(43) : Warning[Pe1105]: ...'
+            else:
+                line_number = int(res.group(8))
+                location = "({}):".format(res.group(8))
+                tool = "iar"
+
+            # Rebuild the line from the match instead of running the regex a second time
+            rest = line[res.end():]
+            line = file + location + rest
+            if self.debug:
+                log().info("%s", line)
+            # The message starts after the space behind the location
+            message_start = len(line) - len(rest) + rest.startswith(" ")
+            return line, tool, (file, line_number, column, message_start)
+        else:
+            return "", "", None
+
+    def match_special(self, line):
+        """
+        Try to match special format assume that line number has been already matched by
+        the function 'self.match_line_and_column()'.
+
+        1. cmocka (unit testing framework for C) output
+        '[   LINE   ] --- testcases.c(9): error: Failure!'
+        """
+        res = REGEX_SPECIAL_CMOCKA.search(line)
+        if self.debug:
+            log().debug("%s", res)
+        if res:
+            line = res.group(1)
+            if self.debug:
+                log().info("%s", line)
+            return line
+        else:
+            return ""
+
+def _parse_file_range(multi_line, encoding, debug, stats, task):
+    """
+    Worker of the jobs option, parse a byte range (starting at a line) of a file, task: (filename, start, end).
+    Return the records, the number of lines and the stats (None without stats option).
+    """
+    filename, range_start, range_end = task
+    with open(filename, "rb") as file_tool_output:
+        file_tool_output.seek(range_start)
+        buffer = file_tool_output.read(range_end - range_start)
+    parser = LineParser(multi_line, encoding, debug, Stats() if stats else None)
+    records = list(parser.parse(parser.read_buffer_lines(buffer, continue_context=True)))
+    return records, parser.cnt_lines, parser.stats
+
+class VSJumpToLineError(Exception):
+    """
+    Invalid options or input files, raised instead of exiting (the command line exits with the exit code).
+    """
+    def __init__(self, message, exit_code, usage=False):
+        super().__init__(message)
+        self.exit_code = exit_code
+        self.usage = usage      # the command line prints the usage too
+
+class Options:
+    """
+    Options of the library API, same meaning as the command line options of the same name.
+    The files are a list of file names (wildcards allowed) or a single file name.
+    An empty encoding is the preferred encoding of the system.
+    """
+    def __init__(self, files=(), multi_line=0, suppress_identical=False, working_dir="", index_cache="",
+                 encoding="", mmap=False, jobs=1, debug=False):
+        self.files = [files] if isinstance(files, str) else list(files)
+        self.multi_line = multi_line
+        self.suppress_identical = suppress_identical
+        self.working_dir = working_dir
+        self.index_cache = index_cache
+        self.encoding = encoding
+        self.mmap = mmap
+        self.jobs = jobs
+        self.debug = debug
+
+class Diagnostic:
+    """
+    A message of the tool output (in Visual Studio format) with its location as matched by the line parser,
+    its multi line context and its line number in the tool output.
+    File and line are empty and 0 if the line has not been converted (unknown tool), the message is the whole text then.
+    """
+    __slots__ = ("severity", "text", "lines_before", "lines_behind", "offset", "tool", "file", "line", "column", "message_start")
+
+    def __init__(self, severity, text, lines_before=(), lines_behind=(), offset=0, tool="", location=None):
+        self.severity = severity
+        self.text = text                    # None if only context is left (message suppressed)
+        self.lines_before = lines_before    # tuples, most messages have no or only a few context lines
+        self.lines_behind = lines_behind
+        self.offset = offset                # line number in the tool output
+        self.tool = tool                    # format of the message ('gcc', 'bullseye', 'iar', 'cmocka'), empty if unknown
+        if location is None:
+            location = ("", 0, 0, 0)
+        # The message is not stored separately, it is the end of the text
+        self.file, self.line, self.column, self.message_start = location
+
+    @property
+    def message(self):
+        return self.text[self.message_start:] if self.text is not None else ""
+
+    def __repr__(self):
+        return "Diagnostic({!r}, {!r}, {!r}, {!r}, {!r}, {!r}, {!r})".format(self.severity, self.text, self.lines_before, self.lines_behind,
+                                                                         self.offset, self.tool,
+                                                                         (self.file, self.line, self.column, self.message_start))
+
+class InternTable:
+    """
+    Table of the unique file paths of the stored results, a path which is repeated in the tool output is stored
+    only once. Counts the lookups for the hit rate in the summary.
+    """
+    def __init__(self):
+        self.indexes = {}       # string -> index into strings
+        self.strings = []
+        self.cnt_lookups = 0
+        self.cnt_hits = 0
+
+    def index(self, string):
+        """
+        Return the index of the string in the table, a new string is added.
+        """
+        self.cnt_lookups += 1
+        index = self.indexes.get(string)
+        if index is None:
+            index = len(self.strings)
+            self.indexes[string] = index
+            self.strings.append(string)
+        else:
+            self.cnt_hits += 1
+        return index
+
+    def intern(self, string):
+        """
+        Return the string of the table which is equal to the string.
+        """
+        return self.strings[self.index(string)]
+
+class DiagnosticStore:
+    """
+    Columnar result list for millions of diagnostics (columnar option): the numbers are stored in arrays,
+    the file paths once in the intern table and all other text (context lines and message bodies after the location)
+    in one contiguous buffer (UTF-8) with end offsets. The diagnostics are created again when the store is iterated.
+    Only the last diagnostic can get further multi line context (look behind).
+    """
+    NO_LOCATION = 0xFFFFFFFF    # file index of a text which is not in Visual Studio format (stored as a whole)
+    NO_TEXT = 0xFFFFFFFE        # file index of context without message
+    TOOLS = ("", "gcc", "bullseye", "iar", "cmocka")
+
+    def __init__(self, intern_table):
+        self.intern_table = intern_table
+        self.severities = array.array("b")
+        self.files = array.array("I")       # index of the file path in the intern table
+        self.lines = array.array("I")
+        self.columns = array.array("I")     # 0 - no column
+        self.tools = array.array("B")       # index into TOOLS
+        self.offsets = array.array("I")     # line number in the tool output
+        self.cnt_before = array.array("B")
+        self.cnt_behind = array.array("I")
+        self.text = bytearray()             # all text segments (UTF-8): lines before, message body, lines behind
+        self.segment_ends = array.array("Q")
+
+    def __len__(self):
+        return len(self.severities)
+
+    def _add_segment(self, text):
+        self.text += text.encode("utf-8", "surrogatepass")
+        self.segment_ends.append(len(self.text))
+
+    def append(self, diagnostic):
+        """
+        Add a diagnostic, the file path, line and column are taken from its location.
+        """
+        file_index, line, column, body = self.NO_TEXT, 0, 0, None
+        if diagnostic.text is not None:
+            file_index, body = self.NO_LOCATION, diagnostic.text
+            if diagnostic.tool and diagnostic.line < self.NO_TEXT and diagnostic.column < self.NO_TEXT:
+                location = self._build_text(diagnostic.file, diagnostic.line, diagnostic.column, "")
+                # Only if the text can be built again exactly (e.g. no leading zeros, no column 0)
+                if diagnostic.text.startswith(location):
+                    body = diagnostic.text[len(location):]
+                    file_index = self.intern_table.index(diagnostic.file)
+                    line, column = diagnostic.line, diagnostic.column
+
+        self.severities.append(diagnostic.severity)
+        self.files.append(file_index)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.tools.append(self.TOOLS.index(diagnostic.tool))
+        self.offsets.append(min(diagnostic.offset, 0xFFFFFFFF))
+        self.cnt_before.append(len(diagnostic.lines_before))
+        self.cnt_behind.append(len(diagnostic.lines_behind))
+        for line_before in diagnostic.lines_before:
+            self._add_segment(line_before)
+        if body is not None:
+            self._add_segment(body)
+        for line_behind in diagnostic.lines_behind:
+            self._add_segment(line_behind)
+
+    def add_context(self, line):
+        """
+        Add a multi line context line (look behind) to the last diagnostic.
+        """
+        self._add_segment(line)
+        self.cnt_behind[-1] += 1
+
+    def _build_text(self, path, line, column, body):
+        if column:
+            return "{}({},{}):{}".format(path, line, column, body)
+        return "{}({}):{}".format(path, line, body)
+
+    def __iter__(self):
+        # Sequential, the text segments are decoded one after the other
+        strings = self.intern_table.strings
+        text = self.text
+        segment_ends = self.segment_ends
+        position = 0
+        segment = 0
+        for index in range(len(self)):
+            lines = []
+            cnt_segments = self.cnt_before[index] + self.cnt_behind[index] + (self.files[index] != self.NO_TEXT)
+            for segment_end in segment_ends[segment:segment + cnt_segments]:
+                lines.append(text[position:segment_end].decode("utf-8", "surrogatepass"))
+                position = segment_end
+            segment += cnt_segments
+
+            cnt_before = self.cnt_before[index]
+            file_index = self.files[index]
+            location = None
+            if file_index == self.NO_TEXT:
+                text_message = None
+                lines_behind = tuple(lines[cnt_before:])
+            else:
+                text_message = lines[cnt_before]
+                if file_index != self.NO_LOCATION:
+                    body = text_message
+                    text_message = self._build_text(strings[file_index], self.lines[index], self.columns[index], body)
+                    location = (strings[file_index], self.lines[index], self.columns[index],
+                                len(text_message) - len(body) + body.startswith(" "))
+                lines_behind = tuple(lines[cnt_before + 1:])
+            yield Diagnostic(Severity(self.severities[index]), text_message, tuple(lines[:cnt_before]), lines_behind,
+                             self.offsets[index], self.TOOLS[self.tools[index]], location)
+
+def diagnostics(options):
+    """
+    Library API: process the input files of the options and return an iterator of the diagnostics.
+    Invalid options raise VSJumpToLineError immediately, nothing is printed.
+    The index of a working directory is kept for further calls, only changed directories are scanned again.
+    """
+    return VSJumpToLine(options=options).diagnostics()
 
 class VSJumpToLine:
     """
@@ -125,8 +879,20 @@ class VSJumpToLine:
     app_name_short = "jtol"     # application short name
     app_version = "v1.1.0"      # application version (major.minor.patch)
     header_len = 100
-
-    def __init__(self, args):
+    range_size = 16 * 1024 * 1024   # size of the file parts for the jobs option
+    progress_size = 1024 * 1024     # minimum size of the input files to show the progress
+    follow_interval = 0.5           # seconds between checks for new lines (follow option)
+    checkpoint_version = 3
+    file_indexes = None             # working directory -> FileIndex, kept between runs by the server and the library API
+    server_mode = False             # running inside the server process
+    checkpoint_counters = ("cnt_suppressed_infos", "cnt_suppressed_notes", "cnt_suppressed_warnings", "cnt_suppressed_errors",
+                           "cnt_infos", "cnt_notes", "cnt_warnings", "cnt_errors", "cnt_lines")
+
+    def __init__(self, args=None, options=None):
+        """
+        Command line: process the input files of the arguments, print_output() prints the results.
+        Library API: check the options object, diagnostics() processes the input files and returns the results.
+        """
         self.EXIT_SUCCESS = 0
         self.EXIT_FAIL_OPTION = 1
         self.EXIT_FAIL_NOT_EXIST = 2
@@ -142,29 +908,88 @@ class VSJumpToLine:
         self.cnt_warnings = 0
         self.cnt_errors = 0
         self.cnt_lines = 0
+        self.cnt_lines_files = {}   # input file -> number of lines
 
-        self.option_file_input = ""
+        self.option_files_input = []
         self.option_line_prefix = ""
         self.option_multi_line = 0
         self.option_suppress_identical = 0
         self.option_working_dir = ""
+        self.option_index_cache = ""
         self.option_compact = 0
         self.option_quiet = 0
+        self.option_stream = 0
+        self.option_spill = 0
+        self.option_flush = ""
+        self.option_encoding = locale.getpreferredencoding(False)
+        self.option_mmap = 0
+        self.option_jobs = 1
+        self.option_follow = 0
+        self.option_checkpoint = ""
+        self.option_debug = 0
+        self.option_stats = 0
+        self.option_columnar = 0
+        self.option_format = "text"
 
         self.time_start = time.time()
         self.time_end = time.time()
 
-        self.result_list = []
+        self.result_lists = {}      # severity -> result list (diagnostics)
+        self.result_set = set()     # all lines of the result list (for the suppress option)
+        self.spill_files = {}       # severity -> temporary file (for the spill option)
+        self.file_index = None
+        self.stats = None
+        self.intern_table = None    # file paths of the stored results
+        self.json_encoder = None    # jsonl format
+        self.json_diagnostic = None # diagnostic which is written when its multi line context is complete (jsonl format)
+
+        self.print_first_message = True
+        self.print_line_before_printed = False
+        self.pending_diagnostics = None     # diagnostics which are not yet returned (library API)
+
+        if options is not None:
+            self.__apply_options(options)
+            return
 
         self.__process_cmdline(args)
+        if not (self.option_stream or self.option_spill):
+            self.intern_table = InternTable()
+        if self.option_format == "jsonl":
+            import json
+            self.json_encoder = json.JSONEncoder(separators=(",", ":"))
+        if self.option_stats:
+            self.stats = Stats()
+            # Only the lookups in the index are counted
+            if self.option_working_dir:
+                self.__convert_to_absolute_path = self.stats.timed(self.__convert_to_absolute_path, "path resolution", count=False)
+            self.__append_result_list = self.stats.timed(self.__append_result_list, "dedupe")
+            # Messages which are printed or written to a temporary file immediately are part of the output
+            if self.option_stream:
+                self.__print_entry = self.stats.timed(self.__print_entry, "output")
+            elif self.option_spill:
+                self.__spill_entry = self.stats.timed(self.__spill_entry, "output")
         self.__process_input_file()
 
+    def _write_line(self, string):
+        """
+        Small helper for buffered output, flushed after each line only with the flush policy 'message'.
+        """
+        sys.stdout.write(string + "\n")
+        if self.option_flush == "message":
+            sys.stdout.flush()
+
+    def _flush_block(self):
+        """
+        Flush the output at the end of a block (header or severity level) unless flushing is done at exit.
+        """
+        if self.option_flush != "exit":
+            sys.stdout.flush()
+
     def _print_normal(self, string):
         """
         Small helper for normal output.
         """
-        print("{}: {}".format(self.app_name_short, string))
-        sys.stdout.flush()
+        self._write_line("{}: {}".format(self.app_name_short, string))
 
     def _print_error(self, string):
         """
@@ -185,148 +1010,190 @@ class VSJumpToLine:
                 path = path[:-1]
         return path
 
-    def __match_severity(self, line):
-        """
-        Determine the severity of a particular line.
+    def __convert_to_absolute_path(self, line, location):
         """
-        severity = Severity.ignore
-        if   ((line.lower().find('note:') > -1) or     # GCC, Doxygen
-              (line.lower().find('note[') > -1) or     # IAR
-              (line.lower().find('info:') > -1) or     # PC-Lint
-              (line.lower().find('info[') > -1)):      # PC-Lint
-            severity = Severity.note
-        elif ((line.lower().find('warning:') > -1) or  # GCC, Doxygen, cmocka
-              (line.lower().find('warning[') > -1) or  # IAR, BullseyeCoverage
-              (line.lower().find(':fail:') > -1)):     # Unity test framework
-            severity = Severity.warning
-        elif ((line.lower().find('error:') > -1) or    # GCC, Doxygen, cmocka
-              (line.lower().find('error[') > -1) or    # IAR
-              (line.lower().find('undefined reference') > -1)): # GCC
-            severity = Severity.error
-        return severity
-
-    def __match_line_and_column(self, line):
+        If only the filename is displayed try using the working directory option to find the absolute path.
+        Assume that line number is already in visual studio format.
+        Return the line and the location with the absolute path, None if the path is not changed.
         """
-        Try to match only line number and/or column.
-
-        GCC/doxygen/cmocka
-        'src/test/testfile.c:124:43: warning: unused parameter 'state' [-Wunused-parameter]'
-        'src/test/testfile.c:124: warning: unused parameter 'state' [-Wunused-parameter]'
-        '[   LINE   ] --- testcases.c:9: error: Failure!'
+        if not self.option_working_dir:
+            return None
 
-        BullseyeCoverage
-        '"c:/testfile.c",276  Warning[Pe177]: ...'
+        res = REGEX_FILENAME_LOCATION.search(line)
+        if self.option_debug:
+            log().debug("line: %s res: %s", line, res)
+        if res:
+            group1_str = res.group(1)
+            # If containing any '/' or '\' assuming that is already an absolute or relative path
+            if (group1_str.find('/') > -1) or (group1_str.find('\\') > -1):
+                return None
+
+            if self.option_debug:
+                log().debug("groups: %s", res.groups())
+
+            # Walk the working directory only once (on first use)
+            if self.file_index is None:
+                self.file_index = self.__get_file_index()
+
+            if self.stats:
+                self.stats.calls["path resolution"] += 1
+            filename_path = self.file_index.lookup(res.group(1))
+            if filename_path:
+                line = filename_path + res.group(4) + ":" + line[res.end():]
+                if self.option_debug:
+                    log().info("%s", line)
+                # The file of the location, if it is the one which has been found
+                if location is not None and location[0] == res.group(1):
+                    location = (filename_path, location[1], location[2], location[3] + len(filename_path) - len(res.group(1)))
+                return line, location
+            if self.option_debug:
+                log().info("File: <%s> not found in working directory!", res.group(1))
+            return None
+        else:
+            return None
 
-        IAR Embedded Workbench
-        'c:\test\testfile.h(43) : Warning[Pe1105]: ...'
+    def __get_file_index(self):
         """
+        Create the index of the working directory. The server keeps the indexes of former runs,
+        they only need to be refreshed.
+        """
+        if self.file_indexes is None:
+            return FileIndex(self.option_working_dir, self.option_index_cache, self.option_debug)
+        key = (os.path.abspath(self.option_working_dir), self.option_working_dir, self.option_index_cache)
+        file_index = self.file_indexes.get(key)
+        if file_index is None:
+            file_index = FileIndex(self.option_working_dir, self.option_index_cache, self.option_debug)
+            self.file_indexes[key] = file_index
+        else:
+            file_index.refresh()
+        return file_index
 
-        # (GCC/doxygen/cmocka | BullseyeCoverage | IAR)
-        regex = r":(\d+):((\d+):)?|(\"(.+)\",(\d+))|(\((\d+)\) :)"
-        res = re.search(regex, line)
-        logging.debug("{}".format(res))
-        if res:
-            # ':124:43:'
-            if res.group(1) and res.group(2):
-                logging.debug("{}".format(res.group(1)))
-                logging.debug("{}".format(res.group(2)))
-                logging.debug("{}".format(res.group(3)))
-                line = re.sub(regex, r"(\1,\3):", line)
-            # ':124:'
-            elif res.group(1):
-                logging.debug("{}".format(res.group(1)))
-                line = re.sub(regex, r"(\1):", line)
-            # '"c:/test.c",276'
-            elif res.group(4):
-                logging.debug("{}".format(res.group(4)))
-                line = re.sub(regex, r"\5(\6):", line)
-            # 'c:\test\testfile.h(43) : Warning[Pe1105]: ...'
-            elif res.group(7):
-                logging.debug("{}".format(res.group(7)))
-                line = re.sub(regex, r"(\8):", line)
-
-            logging.info("{}".format(line))
-            return line
+    def __add_diagnostic(self, diagnostic):
+        """
+        Add a diagnostic to the result list of its severity (and its lines to the result set if identical messages are suppressed).
+        In stream mode the diagnostic is printed immediately instead, in spill mode it is written to a temporary file.
+        """
+        if self.option_suppress_identical:
+            self.result_set.update(diagnostic.lines_before)
+            self.result_set.add(diagnostic.text)
+
+        # Lines which are never printed (depending on the multi line option) are not stored
+        if diagnostic.lines_before and not (self.option_multi_line == 1 or self.option_multi_line == 3):
+            diagnostic.lines_before = ()
+
+        if self.pending_diagnostics is not None:
+            # Returned by diagnostics()
+            self.pending_diagnostics.append(diagnostic)
+        elif self.option_format == "jsonl":
+            self.__write_json()
+            self.json_diagnostic = diagnostic
+            # Without multi line context (look behind) the diagnostic is already complete
+            if not (self.option_multi_line == 2 or self.option_multi_line == 3):
+                self.__write_json()
+        elif self.option_stream:
+            # Print immediately
+            self.__print_diagnostic(diagnostic)
+        elif self.option_spill:
+            # Keep memory flat, one temporary file per severity
+            for line in diagnostic.lines_before:
+                self.__spill_entry(diagnostic.severity + Severity.offset_before, line)
+            self.__spill_entry(diagnostic.severity, diagnostic.text)
         else:
-            return ""
+            self.__store_result(diagnostic)
 
-    def __match_special(self, line):
+    def __store_result(self, diagnostic):
         """
-        Try to match special format assume that line number has been already matched by
-        the function 'self.__match_line_and_column()'.
+        Add a diagnostic to the result list of its severity, a repeated file path is stored only once.
+        """
+        # The columnar store keeps the index of the path instead
+        if diagnostic.file and not self.option_columnar:
+            diagnostic.file = self.intern_table.intern(diagnostic.file)
+        self.__result_list(diagnostic.severity).append(diagnostic)
 
-        1. cmocka (unit testing framework for C) output
-        '[   LINE   ] --- testcases.c(9): error: Failure!'
+    def __result_list(self, severity):
         """
-        regex = r"^\[   LINE   \] --- (.+)"
-        res = re.search(regex, line)
-        logging.debug("{}".format(res))
-        if res:
-            logging.debug("{}".format(res.group(1)))
-            line = re.sub(regex, r"\1", line)
-            logging.info("{}".format(line))
-            return line
+        Return the result list of a severity, a columnar store with the columnar option.
+        """
+        result_list = self.result_lists.get(severity)
+        if result_list is None:
+            result_list = DiagnosticStore(self.intern_table) if self.option_columnar else []
+            self.result_lists[severity] = result_list
+        return result_list
+
+    def __add_context(self, severity, line):
+        """
+        Add a multi line context line (look behind) to the last diagnostic of the severity.
+        """
+        if self.option_suppress_identical:
+            self.result_set.add(line)
+
+        # Lines which are never printed (depending on the multi line option) are not stored
+        if not (self.option_multi_line == 2 or self.option_multi_line == 3):
+            return
+
+        if self.pending_diagnostics is not None:
+            # Context of a suppressed message, the last diagnostic of the severity has already been returned
+            # (another severity in between), only diagnostics with a message are returned
+            if self.pending_diagnostics and self.pending_diagnostics[-1].severity == severity:
+                self.pending_diagnostics[-1].lines_behind += (line,)
+            return
+        elif self.option_format == "jsonl":
+            # Context of a suppressed message, the last diagnostic of the severity has already been written
+            # (another severity in between), it is not written on its own
+            if self.json_diagnostic is not None and self.json_diagnostic.severity == severity:
+                self.json_diagnostic.lines_behind += (line,)
+            return
+        elif self.option_stream:
+            self.__print_entry(severity + Severity.offset_behind, line)
+            return
+        elif self.option_spill:
+            self.__spill_entry(severity + Severity.offset_behind, line)
+            return
+        result_list = self.__result_list(severity)
+        if not result_list:
+            # Context of a suppressed message (without location) at the beginning
+            result_list.append(Diagnostic(severity, None))
+        if isinstance(result_list, DiagnosticStore):
+            result_list.add_context(line)
         else:
-            return ""
+            result_list[-1].lines_behind += (line,)
 
-    def __convert_to_absolute_path(self, line):
+    def __spill_entry(self, severity, line):
         """
-        If only the filename is displayed try using the working directory option to find the absolute path.
-        Assume that line number is already in visual studio format.
+        Write a single line of a diagnostic to the temporary file of its severity (spill option).
         """
-        if not self.option_working_dir:
-            return ""
+        self.__spill_file(severity - severity % 10).write("{}\t{}\n".format(int(severity), line))
 
-        regex = r"((^.+)\.(.+))(\(.+\)):"
-        res = re.search(regex, line)
-        logging.debug("line: {} res:{}".format(line, res))
-        if res:
-            group1_str = res.group(1)
-            # If containing any '/' or '\' assuming that is already an absolute or relative path
-            if (group1_str.find('/') > -1) or (group1_str.find('\\') > -1):
-                return ""
-
-            logging.debug("group1: {}".format(res.group(1)))
-            logging.debug("group2: {}".format(res.group(2)))
-            logging.debug("group3: {}".format(res.group(3)))
-            logging.debug("group4: {}".format(res.group(4)))
-
-            path = self.option_working_dir + "/**/" + res.group(1)
-            for filename_path in glob.iglob(path, recursive=True):
-                logging.debug(filename_path)
-                line = re.sub(regex, "", line)
-                line = filename_path + res.group(4) + ":" + line
-                logging.info("{}".format(line))
-                return line
-            logging.info("File: <{}> not found in working directory!".format(res.group(1)))
-            return ""
-        else:
-            return ""
+    def __spill_file(self, severity):
+        """
+        Return the temporary file of a severity (spill option).
+        """
+        if severity not in self.spill_files:
+            import tempfile
+            self.spill_files[severity] = tempfile.TemporaryFile("w+", encoding="utf-8", errors="surrogateescape")
+        return self.spill_files[severity]
 
-    def __append_result_list(self, severity, line_processed, line_before):
+    def __append_result_list(self, severity, line_processed, line_before, line_number, tool, location):
         """
         Add entry to result list.
         If the option is used to suppress the same messages, only the first message is added to the list.
         """
-        abs_path_line = self.__convert_to_absolute_path(line_processed)
-        if abs_path_line:
-            line_processed = abs_path_line
+        abs_path = self.__convert_to_absolute_path(line_processed, location)
+        if abs_path:
+            line_processed, location = abs_path
 
         # Check if already in list
         already_in_list = False
-        if self.option_suppress_identical:
-            for entry in self.result_list:
-                if line_processed == entry[1]:
-                    if   severity == Severity.info:
-                        self.cnt_suppressed_infos += 1
-                    elif severity == Severity.note:
-                        self.cnt_suppressed_notes += 1
-                    elif severity == Severity.warning:
-                        self.cnt_suppressed_warnings += 1
-                    elif severity == Severity.error:
-                        self.cnt_suppressed_errors += 1
-                    already_in_list = True
-                    break
+        if self.option_suppress_identical and line_processed in self.result_set:
+            if   severity == Severity.info:
+                self.cnt_suppressed_infos += 1
+            elif severity == Severity.note:
+                self.cnt_suppressed_notes += 1
+            elif severity == Severity.warning:
+                self.cnt_suppressed_warnings += 1
+            elif severity == Severity.error:
+                self.cnt_suppressed_errors += 1
+            already_in_list = True
 
         if not already_in_list:
             if   severity == Severity.info:
@@ -340,10 +1207,11 @@ class VSJumpToLine:
 
             # For multi line option (look one line before)
             if self.option_multi_line and line_before:
-                logging.debug("line_look_before: {}".format(line_before))
-                self.result_list.append([ severity + Severity.offset_before, line_before])
-
-            self.result_list.append([severity, line_processed])
+                if self.option_debug:
+                    log().debug("line_look_before: %s", line_before)
+                self.__add_diagnostic(Diagnostic(severity, line_processed, (line_before,), (), line_number, tool, location))
+            else:
+                self.__add_diagnostic(Diagnostic(severity, line_processed, (), (), line_number, tool, location))
 
             return severity
         else:
@@ -351,87 +1219,366 @@ class VSJumpToLine:
 
     def __process_input_file(self):
         """
-        Process the input file.
+        Process the input files (or the standard input).
         """
-        try:
-            with open(self.option_file_input, "r") as file_tool_output:
-                pw = PleaseWait()
-                pw.please_wait_on()
-
-                severity = Severity.ignore
-                line_before = None
-                for file_line in file_tool_output:
-                    self.cnt_lines += 1
-                    file_line = file_line.replace('\n', '')
-                    file_line = file_line.replace('\r', '')
-
-                    severity_last = severity
-                    severity = self.__match_severity(file_line)
-
-                    # Match line before, currently only implemented for GCC
-                    if (re.search(r": In function.+:", file_line, re.IGNORECASE)):
-                        line_before = file_line
-                    else:
-                        line_before = ""
-
-                    # For multi line option (look behind)
-                    if self.option_multi_line and severity_last > Severity.ignore and severity == Severity.ignore:
-                        if file_line and file_line[0] == " ":
-                            # Check if line contains only spaces
-                            if not file_line.isspace():
-                                severity = severity_last
-                                self.result_list.append([severity_last + Severity.offset_behind, file_line])
-                                continue
-
-                    if severity > Severity.ignore:
-                        # Line number and/or column should always match
-                        line_processed_line_column = self.__match_line_and_column(file_line)
-                        # Go into depth
-                        if line_processed_line_column:
-                            line_processed_special = self.__match_special(line_processed_line_column)
-                            if line_processed_special:
-                                severity = self.__append_result_list(severity, line_processed_special, line_before)
-                                continue
-                            else:
-                                severity = self.__append_result_list(severity, line_processed_line_column, line_before)
-                        else:
-                            # Already in Visual Studio format or something new that is not yet covered
-                            logging.info("no match for line: {}".format(file_line))
-                            self.__append_result_list(severity, file_line, line_before)
-                pw.please_wait_off()
-        except UnicodeDecodeError as err:
-            self._print_error("filename: <{}>, err: {}".format(self.option_file_input, err))
+        if self.option_files_input == ["-"]:
+            self.__process_records(self.__input_records())
+            return
+
+        if self.option_follow:
+            filename = self.option_files_input[0]
+            parser = LineParser(self.option_multi_line, self.option_encoding, self.option_debug, self.stats)
+            with open(filename, "rb") as file_tool_output:
+                try:
+                    self.__process_records(parser.parse(parser.follow_lines(file_tool_output, self.follow_interval)))
+                except KeyboardInterrupt:
+                    pass
+            self.cnt_lines_files[filename] = parser.cnt_lines
+            self.cnt_lines += parser.cnt_lines
+            return
+
+        total_size = sum(os.path.getsize(filename) for filename in self.option_files_input)
+        pw = PleaseWait()
+        # In stream mode the dots would be mixed up with the messages, small files are done before the first dot
+        if not self.option_stream and total_size >= self.progress_size:
+            pw.please_wait_on()
+        if self.option_checkpoint:
+            self.__process_checkpoint(self.option_files_input[0])
             pw.please_wait_off()
-            sys.exit(self.EXIT_FAIL_DECODE)
+            return
+        self.__process_records(self.__input_records())
+        pw.please_wait_off()
 
-    def __print_lines(self, severity, result_list):
+    def __input_records(self):
         """
-        Print output lines for a specific severity level.
+        Parse the input files (or the standard input) and return the records, the multi line context ends with each file.
         """
-        first_message = True
-        line_before_printed = False
-        for entry in result_list:
-            if severity == entry[0]:
-                if first_message or self.option_compact or line_before_printed:
-                    print("{}{}".format(self.option_line_prefix, entry[1]))
+        if self.option_files_input == ["-"]:
+            parser = LineParser(self.option_multi_line, self.option_encoding, self.option_debug, self.stats)
+            yield from parser.parse(parser.read_lines(sys.stdin.buffer))
+            self.cnt_lines_files["-"] = parser.cnt_lines
+            self.cnt_lines += parser.cnt_lines
+            return
+
+        total_size = sum(os.path.getsize(filename) for filename in self.option_files_input)
+        if self.option_jobs > 1 and (len(self.option_files_input) > 1 or total_size > self.range_size):
+            yield from self.__parse_parallel()
+            return
+
+        for filename in self.option_files_input:
+            parser = LineParser(self.option_multi_line, self.option_encoding, self.option_debug, self.stats)
+            yield (Record.reset,)
+            with open(filename, "rb") as file_tool_output:
+                # An empty file can't be mapped
+                if self.option_mmap and os.fstat(file_tool_output.fileno()).st_size:
+                    import mmap
+                    with mmap.mmap(file_tool_output.fileno(), 0, access=mmap.ACCESS_READ) as mapped_tool_output:
+                        yield from parser.parse(parser.read_buffer_lines(mapped_tool_output))
                 else:
-                    print("\n{}{}".format(self.option_line_prefix, entry[1]))
-                sys.stdout.flush()
-                first_message = False
-                line_before_printed = False
-            elif (self.option_multi_line == 1 or self.option_multi_line == 3) and (severity + Severity.offset_before == entry[0]): # line before
-                # without prefix
-                if first_message or self.option_compact:
-                    print("{}".format(entry[1]))
-                else:
-                    print("\n{}".format(entry[1]))
-                sys.stdout.flush()
-                first_message = False
-                line_before_printed = True
-            elif (self.option_multi_line == 2 or self.option_multi_line == 3) and (severity + Severity.offset_behind == entry[0]): # line behind
-                # without prefix
-                print("{}".format(entry[1]))
-                sys.stdout.flush()
+                    yield from parser.parse(parser.read_lines(file_tool_output))
+            self.cnt_lines_files[filename] = parser.cnt_lines
+            self.cnt_lines += parser.cnt_lines
+
+    def diagnostics(self):
+        """
+        Library API: process the input files and return an iterator of the diagnostics in the order of the tool output.
+        The counters (cnt_errors, ...) are complete when the iterator is exhausted.
+        """
+        self.pending_diagnostics = []
+        severity = Severity.ignore
+        for record in self.__input_records():
+            severity = self.__process_records((record,), severity)
+            # The last diagnostic may still get multi line context
+            if len(self.pending_diagnostics) > 1:
+                yield from self.pending_diagnostics[:-1]
+                del self.pending_diagnostics[:-1]
+        yield from self.pending_diagnostics
+        self.pending_diagnostics.clear()
+        self.time_end = time.time()
+
+    def __file_ranges(self, filename):
+        """
+        Split a file into byte ranges which start at a line, return the list of (start, end).
+        """
+        size = os.path.getsize(filename)
+        range_starts = [0]
+        with open(filename, "rb") as file_tool_output:
+            while True:
+                file_tool_output.seek(range_starts[-1] + self.range_size)
+                file_tool_output.readline()
+                range_start = file_tool_output.tell()
+                if range_start >= size:
+                    break
+                range_starts.append(range_start)
+        return list(zip(range_starts, range_starts[1:] + [size]))
+
+    def __parse_parallel(self):
+        """
+        Split the files into byte ranges and parse them in worker processes.
+        Return the records of all ranges in the original order, the multi line context ends with each file.
+        """
+        tasks = [(filename, range_start, range_end)
+                 for filename in self.option_files_input
+                 for range_start, range_end in self.__file_ranges(filename)]
+
+        import concurrent.futures
+        import functools
+        parse_file_range = functools.partial(_parse_file_range, self.option_multi_line, self.option_encoding,
+                                             self.option_debug, self.option_stats)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.option_jobs, initializer=_init_worker,
+                                                    initargs=(_log_format,)) as executor:
+            results = executor.map(parse_file_range, tasks)
+            for task, (records, cnt_lines, stats) in zip(tasks, results):
+                if stats:
+                    self.stats.merge(stats)
+                if task[1] == 0:
+                    self.cnt_lines_files[task[0]] = 0
+                    yield (Record.reset,)
+                # The line numbers of the workers start at the beginning of their range
+                line_base = self.cnt_lines_files[task[0]]
+                if line_base:
+                    records = [record[:5] + (record[5] + line_base,) + record[6:] if record[0] == Record.message else record
+                               for record in records]
+                self.cnt_lines_files[task[0]] += cnt_lines
+                self.cnt_lines += cnt_lines
+                yield from records
+
+    def __process_records(self, records, severity=Severity.ignore):
+        """
+        Process the records of the line parser, resolve the multi line context and add the messages to the results.
+        Return the severity the multi line context continues with.
+        """
+        for record in records:
+            if record[0] == Record.message:
+                _record_type, severity_message, line_processed, line_before, use_result, line_number, tool, location = record
+                severity_result = self.__append_result_list(severity_message, line_processed, line_before, line_number, tool, location)
+                severity = severity_result if use_result else severity_message
+            elif record[0] == Record.context and severity > Severity.ignore:
+                self.__add_context(severity, record[1])
+            else:
+                severity = Severity.ignore
+                if self.json_diagnostic is not None:
+                    self.__write_json()
+        return severity
+
+    def __checkpoint_signature(self, filename):
+        """
+        Everything a checkpoint depends on besides the file content.
+        """
+        return [os.path.abspath(filename), self.option_multi_line, self.option_suppress_identical,
+                self.option_working_dir, self.option_encoding]
+
+    def __load_checkpoint(self, filename, file_tool_output, size):
+        """
+        Load the checkpoint and restore the results if it belongs to the beginning of the file.
+        Return the offset to continue from, the hash object of the consumed data and the multi line severity.
+        """
+        import hashlib
+        import json
+        digest = hashlib.sha256()
+        try:
+            with open(self.option_checkpoint, "r", encoding="utf-8") as file_checkpoint:
+                checkpoint = json.load(file_checkpoint)
+            if (checkpoint.get("version") != self.checkpoint_version or
+                    checkpoint["signature"] != self.__checkpoint_signature(filename) or
+                    checkpoint["offset"] > size):
+                return 0, digest, Severity.ignore
+
+            # The consumed part of the file must not have changed
+            remaining = checkpoint["offset"]
+            while remaining:
+                chunk = file_tool_output.read(min(LineParser.chunk_size, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+            if digest.hexdigest() != checkpoint["sha256"]:
+                file_tool_output.seek(0)
+                return 0, hashlib.sha256(), Severity.ignore
+
+            for name, value in checkpoint["counters"].items():
+                setattr(self, name, value)
+            for entries in checkpoint["result_lists"].values():
+                for entry in entries:
+                    self.__store_result(Diagnostic(Severity(entry[0]), entry[1], tuple(entry[2]), tuple(entry[3]), entry[4],
+                                                   entry[5], tuple(entry[6])))
+            self.result_set = set(checkpoint["result_set"])
+            return checkpoint["offset"], digest, Severity(checkpoint["severity"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as err:
+            if self.option_debug:
+                log().info("checkpoint: <%s> not used: %s", self.option_checkpoint, err)
+            file_tool_output.seek(0)
+            return 0, hashlib.sha256(), Severity.ignore
+
+    def __save_checkpoint(self, filename, offset, digest, severity):
+        """
+        Store the state after the processed part of the file in the checkpoint file.
+        """
+        import json
+        counters = {name: getattr(self, name) for name in self.checkpoint_counters}
+        checkpoint = {
+            "version": self.checkpoint_version,
+            "signature": self.__checkpoint_signature(filename),
+            "offset": offset,
+            "sha256": digest.hexdigest(),
+            "severity": int(severity),
+            "counters": counters,
+            "result_lists": {int(severity): [[int(diagnostic.severity), diagnostic.text, diagnostic.lines_before,
+                                               diagnostic.lines_behind, diagnostic.offset, diagnostic.tool,
+                                               [diagnostic.file, diagnostic.line, diagnostic.column, diagnostic.message_start]]
+                                              for diagnostic in result_list]
+                             for severity, result_list in self.result_lists.items()},
+            "result_set": list(self.result_set),
+        }
+        checkpoint_tmp = "{}.{}.tmp".format(self.option_checkpoint, os.getpid())
+        try:
+            with open(checkpoint_tmp, "w", encoding="utf-8") as file_checkpoint:
+                json.dump(checkpoint, file_checkpoint)
+            os.replace(checkpoint_tmp, self.option_checkpoint)
+        except OSError as err:
+            log().warning("checkpoint: <%s> not written: %s", self.option_checkpoint, err)
+
+    def __process_checkpoint(self, filename):
+        """
+        Process only the part of the file which has been appended since the checkpoint was written.
+        The checkpoint is written after the last complete line, an incomplete last line is processed but not stored.
+        """
+        with open(filename, "rb") as file_tool_output:
+            size = os.fstat(file_tool_output.fileno()).st_size
+
+            # End of the last complete line
+            line_end = size
+            while line_end > 0:
+                file_tool_output.seek(max(0, line_end - LineParser.chunk_size))
+                chunk = file_tool_output.read(line_end - file_tool_output.tell())
+                pos = chunk.rfind(b"\n")
+                if pos > -1:
+                    line_end = line_end - len(chunk) + pos + 1
+                    break
+                line_end -= len(chunk)
+            file_tool_output.seek(0)
+
+            offset, digest, severity = self.__load_checkpoint(filename, file_tool_output, size)
+            if self.option_debug:
+                log().info("checkpoint: continue at offset: %s", offset)
+
+            # The line numbers continue after the lines of the checkpoint
+            parser = LineParser(self.option_multi_line, self.option_encoding, self.option_debug, self.stats)
+            parser.cnt_lines = self.cnt_lines
+            severity = self.__process_records(parser.parse(parser.read_lines(file_tool_output, line_end - offset, digest)), severity)
+            self.cnt_lines = parser.cnt_lines
+            self.__save_checkpoint(filename, line_end, digest, severity)
+
+            # Incomplete last line
+            parser = LineParser(self.option_multi_line, self.option_encoding, self.option_debug, self.stats)
+            parser.cnt_lines = self.cnt_lines
+            self.__process_records(parser.parse(parser.read_lines(file_tool_output)), severity)
+            self.cnt_lines = parser.cnt_lines
+        self.cnt_lines_files[filename] = self.cnt_lines
+
+    def __print_diagnostic(self, diagnostic):
+        """
+        Print a diagnostic with its multi line context.
+        """
+        for line in diagnostic.lines_before:
+            self.__print_entry(diagnostic.severity + Severity.offset_before, line)
+        if diagnostic.text is not None:
+            self.__print_entry(diagnostic.severity, diagnostic.text)
+        for line in diagnostic.lines_behind:
+            self.__print_entry(diagnostic.severity + Severity.offset_behind, line)
+
+    def __write_json(self):
+        """
+        Write the held back diagnostic as JSON object in a single line (jsonl format).
+        """
+        diagnostic = self.json_diagnostic
+        if diagnostic is None:
+            return
+        self.json_diagnostic = None
+        self._write_line(self.json_encoder.encode({
+            "file": diagnostic.file,
+            "line": diagnostic.line,
+            "column": diagnostic.column,
+            "severity": diagnostic.severity.name,
+            "tool": diagnostic.tool,
+            "message": diagnostic.message,
+            "lines_before": diagnostic.lines_before,
+            "lines_behind": diagnostic.lines_behind,
+            "log_line": diagnostic.offset,
+        }))
+
+    def __print_entry(self, severity, line):
+        """
+        Print a single line of a diagnostic.
+        """
+        offset = severity % 10
+        if offset == Severity.offset_before: # line before
+            # without prefix
+            if self.print_first_message or self.option_compact:
+                self._write_line(line)
+            else:
+                self._write_line("\n" + line)
+            self.print_first_message = False
+            self.print_line_before_printed = True
+        elif offset == Severity.offset_behind: # line behind
+            # without prefix
+            self._write_line(line)
+        else:
+            if self.print_first_message or self.option_compact or self.print_line_before_printed:
+                self._write_line(self.option_line_prefix + line)
+            else:
+                self._write_line("\n" + self.option_line_prefix + line)
+            self.print_first_message = False
+            self.print_line_before_printed = False
+
+    def __result_entries(self, severity):
+        """
+        Return the diagnostics to print for a specific severity level.
+        """
+        if not self.option_spill:
+            return self.result_lists.get(severity, [])
+        spill_file = self.spill_files.get(severity)
+        if spill_file is None:
+            return []
+        spill_file.seek(0)
+        return self.__read_spill_file(spill_file)
+
+    def __read_spill_file(self, spill_file):
+        """
+        Read back the diagnostics of a spill file (a line before or a message starts a new diagnostic).
+        """
+        diagnostic = None
+        for spill_line in spill_file:
+            entry_severity, line = spill_line[:-1].split("\t", 1)
+            entry_severity = int(entry_severity)
+            offset = entry_severity % 10
+            if offset == Severity.offset_behind:
+                if diagnostic is None:
+                    diagnostic = Diagnostic(Severity(entry_severity - offset), None)
+                diagnostic.lines_behind += (line,)
+                continue
+            if diagnostic is not None and (offset == Severity.offset_before or diagnostic.text is not None):
+                yield diagnostic
+                diagnostic = None
+            if diagnostic is None:
+                diagnostic = Diagnostic(Severity(entry_severity - offset), None)
+            if offset == Severity.offset_before:
+                diagnostic.lines_before += (line,)
+            else:
+                diagnostic.text = line
+        if diagnostic is not None:
+            yield diagnostic
+        spill_file.close()
+
+    def __print_lines(self, result_list):
+        """
+        Print output lines of the result list of a specific severity level.
+        """
+        self.print_first_message = True
+        self.print_line_before_printed = False
+        for diagnostic in result_list:
+            self.__print_diagnostic(diagnostic)
+        self._flush_block()
 
     def usage(self):
         """
@@ -449,10 +1596,16 @@ class VSJumpToLine:
         self._print_normal("The output of this tool can be used in the output window of Visual Studio to jump to the")
         self._print_normal("corresponding line in the editor.")
         self._print_normal("")
-        self._print_normal("Usage: "+ self.app_name + ".py -f filename [-d directory] [-p prefix] [-m {0|1|3}] [-s] [-c]")
+        self._print_normal("Usage: "+ self.app_name + ".py [-f filename] [-d directory] [-i cachefile] [-p prefix] [-m {0|1|3}] [-s] [-c] [-t|-g] [-b policy] [-e encoding] [-r] [-j jobs] [-w] [-k checkpoint] [-o format]")
         self._print_normal("")
-        self._print_normal("-f --file <filename>  : File which contains the tool output")
-        self._print_normal("-d --dir <directory>  : Working directory for absolute path search (can be slow)")
+        self._print_normal("-f --file <filename>  : File which contains the tool output, wildcards and multiple -f are allowed")
+        self._print_normal("                      : (the messages of all files are grouped and suppressed together)")
+        self._print_normal("                      : '-' or no file - read from stdin and print messages immediately")
+        self._print_normal("-e --encoding <name>  : Encoding of the tool output, ASCII compatible (default: {}), invalid bytes are replaced".format(self.option_encoding))
+        self._print_normal("-r --mmap             : Map the file into memory and only read lines with a severity (large files)")
+        self._print_normal("-j --jobs <number>    : Parse multiple or large files in parallel with a number of processes")
+        self._print_normal("-d --dir <directory>  : Working directory for absolute path search")
+        self._print_normal("-i --index <filename> : Cache file for the working directory index (faster --dir)")
         self._print_normal("-p --prefix <prefix>  : Add prefix to output line")
         self._print_normal("-m --multi {1|2|3}    : Enable multi line support")
         self._print_normal("                      : 1 - one line before")
@@ -461,31 +1614,178 @@ class VSJumpToLine:
         self._print_normal("-s --suppress         : Suppress identical messages")
         self._print_normal("-c --compact          : Don't add newline between messages")
         self._print_normal("-q --quiet            : Don't show information about the specified options")
+        self._print_normal("-t --stream           : Print messages immediately (not grouped, constant memory)")
+        self._print_normal("-g --spill            : Group messages via temporary files (constant memory)")
+        self._print_normal("-w --follow           : Wait for lines appended to the file and print them immediately (like 'tail -f')")
+        self._print_normal("                      : stop with Ctrl+C")
+        self._print_normal("-k --checkpoint <file>: Store the state in a checkpoint file, the next run only processes")
+        self._print_normal("                      : lines appended to the input file since then")
+        self._print_normal("-b --flush <policy>   : Flush the output after each 'message', 'block' or at 'exit'")
+        self._print_normal("                      : default - 'message' in stream mode, otherwise 'block'")
+        self._print_normal("-o --format <format>  : Output format 'text' (default) or 'jsonl' - one JSON object per message")
+        self._print_normal("                      : (file, line, column, severity, tool, message, multi line context, line")
+        self._print_normal("                      : number in the tool output), printed immediately without headers and totals")
+        self._print_normal("   --stats            : Print the time of the processing phases and the number of calls")
+        self._print_normal("   --columnar         : Compact storage of the messages for very large numbers of messages")
+        self._print_normal("                      : (slower, no effect in stream and spill mode)")
+        self._print_normal("   --debug            : Debug output of the parser (slow, only for troubleshooting)")
+        self._print_normal("")
+        self._print_normal("Server mode (keeps the interpreter, the regular expressions and the --dir index loaded):")
+        self._print_normal("  " + self.app_name + ".py --server           : Start the server (stop with Ctrl+C)")
+        self._print_normal("  " + self.app_name + ".py --client <options> : Let the server do the work, the options are the same as above")
+        self._print_normal("                      : (without running server the work is done by the client itself)")
         self._print_normal("")
         self._print_normal("Example: " + self.app_name + ".py -f c:/pro/gcc_output.txt -d c:/pro/src -p src/pro/ --multi 2 -s")
         self._print_normal(header_line)
 
+    def __apply_options(self, options):
+        """
+        Take over the options of the library API.
+        Raise VSJumpToLineError for invalid options.
+        """
+        if not options.files:
+            raise VSJumpToLineError("No input file specified!", self.EXIT_FAIL_OPTION)
+        if options.multi_line not in (0, 1, 2, 3):
+            raise VSJumpToLineError("multi_line allows only 0, 1, 2 or 3", self.EXIT_FAIL_OPTION)
+        if options.jobs < 1:
+            raise VSJumpToLineError("jobs allows only numbers greater than 0", self.EXIT_FAIL_OPTION)
+        if options.encoding:
+            try:
+                self.option_encoding = lookup_encoding(options.encoding)
+            except LookupError as err:
+                raise VSJumpToLineError("encoding: <{}>, {}".format(options.encoding, err), self.EXIT_FAIL_OPTION) from None
+        self.option_files_input = list(options.files)
+        self.option_multi_line = options.multi_line
+        self.option_suppress_identical = int(bool(options.suppress_identical))
+        self.option_working_dir = options.working_dir
+        self.option_index_cache = options.index_cache
+        self.option_mmap = int(bool(options.mmap))
+        self.option_jobs = options.jobs
+        self.option_debug = int(bool(options.debug))
+        self.__check_options()
+        # Like the server, further calls only scan the changed directories of the working directory again
+        if VSJumpToLine.file_indexes is None:
+            VSJumpToLine.file_indexes = {}
+
+    def __check_options(self):
+        """
+        Check the combination of the options and expand the wildcards of the input files.
+        Raise VSJumpToLineError for invalid options.
+        """
+        if self.option_stream and self.option_spill:
+            raise VSJumpToLineError("options --stream and --spill can't be used together", self.EXIT_FAIL_OPTION, usage=True)
+
+        if self.option_format == "jsonl":
+            # The stats are no JSON objects
+            if self.option_spill or self.option_checkpoint or self.option_stats:
+                raise VSJumpToLineError("option --format jsonl can't be used with --spill, --checkpoint or --stats", self.EXIT_FAIL_OPTION, usage=True)
+            # Each message is written as soon as it is complete
+            self.option_stream = 1
+
+        if "-" in self.option_files_input:
+            if len(self.option_files_input) > 1:
+                raise VSJumpToLineError("the standard input can't be combined with other input files", self.EXIT_FAIL_OPTION, usage=True)
+            if self.option_mmap or self.option_jobs > 1 or self.option_follow or self.option_checkpoint:
+                raise VSJumpToLineError("options --mmap, --jobs, --follow and --checkpoint need an input file", self.EXIT_FAIL_OPTION, usage=True)
+            # Standard input is streamed unless grouping via spill files is requested
+            if not self.option_spill:
+                self.option_stream = 1
+        else:
+            # Expand wildcards, each file is processed only once
+            files_input = []
+            for pattern in self.option_files_input:
+                if REGEX_GLOB_MAGIC.search(pattern):
+                    import glob
+                    filenames = sorted(glob.glob(pattern))
+                else:
+                    filenames = [pattern]
+                filenames = [filename for filename in filenames if os.path.isfile(filename)]
+                if not filenames:
+                    raise VSJumpToLineError("--filename: <{}>, file does not exits!".format(pattern), self.EXIT_FAIL_NOT_EXIST)
+                for filename in filenames:
+                    if filename not in files_input:
+                        files_input.append(filename)
+            self.option_files_input = files_input
+
+            if self.option_follow:
+                if len(self.option_files_input) > 1 or self.option_mmap or self.option_jobs > 1 or self.option_spill:
+                    raise VSJumpToLineError("option --follow needs exactly one input file and can't be used with --mmap, --jobs or --spill", self.EXIT_FAIL_OPTION, usage=True)
+                # New lines are printed as soon as they are appended
+                self.option_stream = 1
+
+            if self.option_follow and self.server_mode:
+                raise VSJumpToLineError("option --follow can't be used with the server", self.EXIT_FAIL_OPTION)
+
+            if self.option_checkpoint:
+                if (len(self.option_files_input) > 1 or self.option_jobs > 1 or self.option_follow or
+                        self.option_stream or self.option_spill):
+                    raise VSJumpToLineError("option --checkpoint needs exactly one input file and can't be used with --jobs, --follow, --stream or --spill", self.EXIT_FAIL_OPTION, usage=True)
+
+        if not self.option_flush:
+            self.option_flush = "message" if self.option_stream else "block"
+
+        if self.option_working_dir:
+            if not os.path.isdir(self.option_working_dir):
+                raise VSJumpToLineError("--directory: <{}>, directory does not exits!".format(self.option_working_dir), self.EXIT_FAIL_NOT_EXIST)
+
     def __process_cmdline(self, argv):
         """
         Process command-line arguments and output some configuration information.
         Start the entire process.
         """
         try:
-            opts, _args = getopt.getopt(argv[1:], "h?scqm:f:p:d:", ["help", "quiet", "multi=", "suppress", "compact", "file=", "prefix=", "dir="])
+            opts, _args = getopt.getopt(argv[1:], "h?scqtgrwm:f:p:d:i:b:e:j:k:o:", ["help", "quiet", "stream", "spill", "mmap", "follow", "checkpoint=", "multi=", "suppress", "compact", "file=", "prefix=", "dir=", "index=", "flush=", "encoding=", "jobs=", "debug", "stats", "columnar", "format="])
         except getopt.GetoptError as err:
             self._print_error(err)
             self.usage()
             sys.exit(self.EXIT_FAIL_OPTION)
+        # Known before the other options, their debug output depends on it
+        self.option_debug = int(("--debug", "") in opts)
         for opt, arg in opts:
             if opt in ("-h", "-?", "--help"):
                 self.usage()
                 sys.exit(self.EXIT_SUCCESS)
             elif opt in ("-f", "--file"):
-                self.option_file_input = arg
-                logging.debug("--file: {}".format(self.option_file_input))
+                self.option_files_input.append(self._format_paths(arg))
+                if self.option_debug:
+                    log().debug("--file: %s", arg)
+            elif opt in ("-j", "--jobs"):
+                if arg.isdigit() and int(arg) >= 1:
+                    self.option_jobs = int(arg)
+                else:
+                    self._print_error("argument --jobs allows only numbers greater than 0")
+                    self.usage()
+                    sys.exit(self.EXIT_FAIL_OPTION)
+            elif opt in ("-k", "--checkpoint"):
+                self.option_checkpoint = arg
+                if self.option_debug:
+                    log().debug("--checkpoint: %s", self.option_checkpoint)
+            elif opt in ("-w", "--follow"):
+                self.option_follow = 1
+            elif opt in ("-r", "--mmap"):
+                self.option_mmap = 1
+            elif opt == "--stats":
+                self.option_stats = 1
+            elif opt == "--columnar":
+                self.option_columnar = 1
+            elif opt in ("-o", "--format"):
+                if arg in ("text", "jsonl"):
+                    self.option_format = arg
+                else:
+                    self._print_error("argument --format allows only 'text' or 'jsonl'")
+                    self.usage()
+                    sys.exit(self.EXIT_FAIL_OPTION)
+            elif opt in ("-e", "--encoding"):
+                try:
+                    self.option_encoding = lookup_encoding(arg)
+                except LookupError as err:
+                    self._print_error("argument --encoding: <{}>, {}".format(arg, err))
+                    self.usage()
+                    sys.exit(self.EXIT_FAIL_OPTION)
             elif opt in ("-p", "--prefix"):
                 self.option_line_prefix = arg
-                logging.debug("--prefix: {}".format(self.option_line_prefix))
+                if self.option_debug:
+                    log().debug("--prefix: %s", self.option_line_prefix)
             elif opt in ("-m", "--multi"):
                 if arg.isdigit() and int(arg) >= 1 and int(arg) <= 3:
                     self.option_multi_line = int(arg)
@@ -500,28 +1800,46 @@ class VSJumpToLine:
                 self.option_compact = 1
             elif opt in ("-q", "--quiet"):
                 self.option_quiet = 1
+            elif opt in ("-t", "--stream"):
+                self.option_stream = 1
+            elif opt in ("-g", "--spill"):
+                self.option_spill = 1
+            elif opt in ("-b", "--flush"):
+                if arg in ("message", "block", "exit"):
+                    self.option_flush = arg
+                else:
+                    self._print_error("argument --flush allows only 'message', 'block' or 'exit'")
+                    self.usage()
+                    sys.exit(self.EXIT_FAIL_OPTION)
             elif opt in ("-d", "--dir"):
-                self.option_working_dir = arg
-                logging.debug("--dir: {}".format(self.option_working_dir))
-
-        if not self.option_file_input:
+                self.option_working_dir = self._format_paths(arg)
+                if self.option_debug:
+                    log().debug("--dir: %s", self.option_working_dir)
+            elif opt in ("-i", "--index"):
+                self.option_index_cache = arg
+                if self.option_debug:
+                    log().debug("--index: %s", self.option_index_cache)
+
+        # Without input file read from the standard input (if something is piped in)
+        if not self.option_files_input and not sys.stdin.isatty():
+            self.option_files_input = ["-"]
+
+        if not self.option_files_input:
             self._print_error("No input file specified!")
             self.usage()
             sys.exit(self.EXIT_FAIL_OPTION)
 
-        self.option_file_input = self._format_paths(self.option_file_input)
+        try:
+            self.__check_options()
+        except VSJumpToLineError as err:
+            self._print_error(err)
+            if err.usage:
+                self.usage()
+            sys.exit(err.exit_code)
 
-        if not os.path.isfile(self.option_file_input):
-            self._print_error("--filename: <{}>, file does not exits!".format(self.option_file_input))
-            sys.exit(self.EXIT_FAIL_NOT_EXIST)
-        else:
-            statbuf = os.stat(self.option_file_input)
-
-        if self.option_working_dir:
-            self.option_working_dir = self._format_paths(self.option_working_dir)
-            if not os.path.isdir(self.option_working_dir):
-                self._print_error("--directory: <{}>, directory does not exits!".format(self.option_working_dir))
-                sys.exit(self.EXIT_FAIL_NOT_EXIST)
+        # Only the messages are written in jsonl format
+        if self.option_format == "jsonl":
+            return
 
         header_line = ""
         header_title = " " + self.app_name + " " + self.app_version + " "
@@ -534,33 +1852,49 @@ class VSJumpToLine:
 
         if not self.option_quiet:
             self._print_normal("options:")
-            self._print_normal("--filename: <{}>".format(self.option_file_input))
-            self._print_normal("--filename: size: <{}>, modified: <{}>".format(FormatSize(os.path.getsize(self.option_file_input)), time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(statbuf.st_mtime))))
-            self._print_normal("--directory: <{}>".format(self.option_working_dir))
-            self._print_normal("--prefix: <{}>, --multi: <{}>, --suppress: <{}>, --compact: <{}>".format(self.option_line_prefix, self.option_multi_line, self.option_suppress_identical, self.option_compact))
+            if self.option_files_input == ["-"]:
+                self._print_normal("--filename: <stdin>, --encoding: <{}>".format(self.option_encoding))
+            else:
+                for filename in self.option_files_input:
+                    statbuf = os.stat(filename)
+                    self._print_normal("--filename: <{}>".format(filename))
+                    self._print_normal("--filename: size: <{}>, modified: <{}>".format(FormatSize(statbuf.st_size), time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(statbuf.st_mtime))))
+                self._print_normal("--encoding: <{}>, --mmap: <{}>, --jobs: <{}>, --follow: <{}>, --checkpoint: <{}>".format(self.option_encoding, self.option_mmap, self.option_jobs, self.option_follow, self.option_checkpoint))
+            self._print_normal("--directory: <{}>, --index: <{}>".format(self.option_working_dir, self.option_index_cache))
+            self._print_normal("--prefix: <{}>, --multi: <{}>, --suppress: <{}>, --compact: <{}>, --stream: <{}>, --spill: <{}>, --flush: <{}>".format(self.option_line_prefix, self.option_multi_line, self.option_suppress_identical, self.option_compact, self.option_stream, self.option_spill, self.option_flush))
             self._print_normal(header_line)
+        self._flush_block()
 
     def print_output(self):
         """
         Print the whole output (all messages).
+        In stream mode the messages have already been printed, only the totals are left.
         """
-        if self.cnt_notes:
-            header_title = " notes: {} ".format(self.cnt_notes)
-            header_title = header_title.center(self.header_len, '+')
-            self._print_normal(header_title)
-            self.__print_lines(Severity.note, self.result_list)
-
-        if self.cnt_warnings:
-            header_title = " warnings: {} ".format(self.cnt_warnings)
-            header_title = header_title.center(self.header_len, '*')
-            self._print_normal(header_title)
-            self.__print_lines(Severity.warning, self.result_list)
-
-        if self.cnt_errors:
-            header_title = " errors: {} ".format(self.cnt_errors)
-            header_title = header_title.center(self.header_len, '#')
-            self._print_normal(header_title)
-            self.__print_lines(Severity.error, self.result_list)
+        if self.option_format == "jsonl":
+            # The last message may still wait for its multi line context, no totals
+            self.__write_json()
+            sys.stdout.flush()
+            return
+
+        time_output = time.perf_counter()
+        if not self.option_stream:
+            if self.cnt_notes:
+                header_title = " notes: {} ".format(self.cnt_notes)
+                header_title = header_title.center(self.header_len, '+')
+                self._print_normal(header_title)
+                self.__print_lines(self.__result_entries(Severity.note))
+
+            if self.cnt_warnings:
+                header_title = " warnings: {} ".format(self.cnt_warnings)
+                header_title = header_title.center(self.header_len, '*')
+                self._print_normal(header_title)
+                self.__print_lines(self.__result_entries(Severity.warning))
+
+            if self.cnt_errors:
+                header_title = " errors: {} ".format(self.cnt_errors)
+                header_title = header_title.center(self.header_len, '#')
+                self._print_normal(header_title)
+                self.__print_lines(self.__result_entries(Severity.error))
 
         self.time_end = time.time()
 
@@ -577,12 +1911,256 @@ class VSJumpToLine:
             self.cnt_warnings + self.cnt_suppressed_warnings, self.cnt_suppressed_warnings,
             self.cnt_notes + self.cnt_suppressed_notes, self.cnt_suppressed_notes,
             self.cnt_lines))
+        # Lines per file if several files have been processed
+        if len(self.cnt_lines_files) > 1:
+            for filename, cnt_lines in self.cnt_lines_files.items():
+                self._print_normal("--filename: <{}>, lines: {}".format(filename, cnt_lines))
+        if self.intern_table is not None and self.intern_table.cnt_lookups:
+            self._print_normal("--interning: file paths: lookups: {}, unique: {}, hit rate: {:.1f}%".format(
+                self.intern_table.cnt_lookups, len(self.intern_table.strings),
+                100.0 * self.intern_table.cnt_hits / self.intern_table.cnt_lookups))
+        if self.stats:
+            self.stats.times["output"] += time.perf_counter() - time_output
+            self.__print_stats()
         self._print_normal(header_line)
+        sys.stdout.flush()
+
+    def __print_stats(self):
+        """
+        Print the time of the processing phases (stats option).
+        """
+        times = self.stats.times
+        calls = self.stats.calls
+        time_other = (self.time_end - self.time_start) - sum(times.values())
+        self._print_normal("--stats: " + ", ".join("{}: {:.2f}s".format(phase, times[phase]) for phase in Stats.phases) +
+                           ", other: {:.2f}s".format(max(time_other, 0.0)))
+        # Each call of these phases runs one or two regular expressions, only the lookups of the path resolution are counted
+        self._print_normal("--stats: calls: classification: {}, location rewrite: {}, index lookups: {}".format(
+                           calls["classification"], calls["location rewrite"], calls["path resolution"]) +
+                           ", dedupe: {}, suppressed: {}".format(calls["dedupe"],
+                                                                 self.cnt_suppressed_errors + self.cnt_suppressed_warnings +
+                                                                 self.cnt_suppressed_notes + self.cnt_suppressed_infos))
+        if self.file_index is not None:
+            self._print_normal("--stats: index: directory scans: {}, cache hits: {}, file names: {}".format(
+                self.file_index.cnt_scanned_dirs, self.file_index.cnt_cached_dirs, len(self.file_index.files)))
+        if self.option_jobs > 1:
+            self._print_normal("--stats: the parser phases are the sum of all jobs")
+
+def server_directory():
+    """
+    Private directory of the server (socket and key file), only accessible by the user.
+    Raise OSError if the directory belongs to somebody else or is accessible by others.
+    """
+    if sys.platform == "win32":
+        directory = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), VSJumpToLine.app_name)
+        os.makedirs(directory, exist_ok=True)
+        return directory
+    import stat
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        directory = os.path.join(runtime_dir, VSJumpToLine.app_name)
+    else:
+        import tempfile
+        directory = os.path.join(tempfile.gettempdir(), "{}-{}".format(VSJumpToLine.app_name, os.getuid()))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    # In the shared temporary directory another user may have created it before
+    status = os.lstat(directory)
+    if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise OSError("server directory: <{}> is not private".format(directory))
+    return directory
+
+def server_address(directory):
+    """
+    Address of the server, a named pipe on Windows and a Unix domain socket in the server directory otherwise.
+    """
+    if sys.platform == "win32":
+        return r"\\.\pipe\{}-{}".format(VSJumpToLine.app_name, os.environ.get("USERNAME", ""))
+    return os.path.join(directory, "server.sock")
+
+def server_authkey(directory, create=False):
+    """
+    Secret key of the server (file only readable by the user), client and server authenticate each other with it.
+    The server creates a new key on start. Return None if there is no key.
+    """
+    key_file = os.path.join(directory, "server.key")
+    if create:
+        key_file_tmp = "{}.{}.tmp".format(key_file, os.getpid())
+        with os.fdopen(os.open(key_file_tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as file_key:
+            file_key.write(os.urandom(32))
+        os.replace(key_file_tmp, key_file)
+    try:
+        with open(key_file, "rb") as file_key:
+            return file_key.read()
+    except OSError:
+        return None
+
+class ConnectionWriter:
+    """
+    Replacement for sys.stdout in the server, the output is sent to the client.
+    Messages to the client: b"o" + output, b"i" + size (request for input data), b"x" + exit code.
+    """
+    buffer_size = 64 * 1024
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.parts = []
+        self.size = 0
+
+    def write(self, string):
+        self.parts.append(string)
+        self.size += len(string)
+        if self.size >= self.buffer_size:
+            self.flush()
+        return len(string)
+
+    def flush(self):
+        if self.parts:
+            self.connection.send_bytes(b"o" + "".join(self.parts).encode("utf-8", "replace"))
+            self.parts = []
+            self.size = 0
+
+class ConnectionReader:
+    """
+    Replacement for sys.stdin (and sys.stdin.buffer) in the server, the data is requested from the client.
+    """
+    def __init__(self, connection, is_tty):
+        self.connection = connection
+        self.is_tty = is_tty
+        self.buffer = self
+
+    def isatty(self):
+        return self.is_tty
+
+    def read1(self, size):
+        self.connection.send_bytes(b"i" + str(size).encode("ascii"))
+        return self.connection.recv_bytes()
+
+class VSJumpToLineServer:
+    """
+    Resident server: runs VSJumpToLine for each client request in the same process, so the interpreter
+    start, the imports, the compiled regular expressions and the indexes of the working directories
+    are reused. The requests are processed one after the other.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.address = server_address(directory)
+        VSJumpToLine.file_indexes = {}
+        VSJumpToLine.server_mode = True
+
+    def serve_forever(self):
+        """
+        Accept and process client requests until interrupted.
+        """
+        import multiprocessing.connection
+        if not sys.platform == "win32":
+            # Remove a socket file left over by a server which has not been stopped properly
+            if os.path.exists(self.address):
+                try:
+                    multiprocessing.connection.Client(self.address).close()
+                    log().error("server: <%s> is already running", self.address)
+                    return 1
+                except OSError:
+                    os.remove(self.address)
+        # A new key for each start, clients of a former server are refused
+        authkey = server_authkey(self.directory, create=True)
+        with multiprocessing.connection.Listener(self.address, authkey=authkey) as listener:
+            if not sys.platform == "win32":
+                os.chmod(self.address, 0o600)
+            print("{}: server: <{}>".format(VSJumpToLine.app_name_short, self.address))
+            sys.stdout.flush()
+            try:
+                while True:
+                    try:
+                        connection = listener.accept()
+                    except (OSError, EOFError, multiprocessing.AuthenticationError) as err:
+                        log().warning("server: connection refused: %s", err)
+                        continue
+                    with connection:
+                        self.handle(connection)
+            except KeyboardInterrupt:
+                pass
+        return 0
+
+    def handle(self, connection):
+        """
+        Process a single client request: {"argv": [...], "cwd": "...", "stdin_isatty": bool}
+        """
+        import json
+        stdout, stdin, cwd = sys.stdout, sys.stdin, os.getcwd()
+        exit_code = 0
+        try:
+            request = json.loads(connection.recv_bytes().decode("utf-8"))
+            os.chdir(request["cwd"])
+            sys.stdout = ConnectionWriter(connection)
+            sys.stdin = ConnectionReader(connection, request["stdin_isatty"])
+            try:
+                jtol = VSJumpToLine(request["argv"])
+                jtol.print_output()
+            except SystemExit as err:
+                exit_code = err.code if isinstance(err.code, int) else 1
+            except Exception as err:
+                log().exception("server: request failed")
+                sys.stdout.write("{}: ERROR: {}\n".format(VSJumpToLine.app_name_short, err))
+                exit_code = 1
+            sys.stdout.flush()
+            connection.send_bytes(b"x" + str(exit_code).encode("ascii"))
+        except (OSError, EOFError, ValueError, KeyError) as err:
+            log().warning("server: connection lost: %s", err)
+        finally:
+            sys.stdout, sys.stdin = stdout, stdin
+            os.chdir(cwd)
+
+def run_client(args):
+    """
+    Send the request to the server and print its output.
+    Return the exit code or None if no server is running (or it can't be trusted).
+    """
+    import json
+    import multiprocessing.connection
+    try:
+        directory = server_directory()
+    except OSError as err:
+        log().warning("client: %s", err)
+        return None
+    authkey = server_authkey(directory)
+    if authkey is None:
+        return None
+    try:
+        connection = multiprocessing.connection.Client(server_address(directory), authkey=authkey)
+    except (OSError, EOFError, multiprocessing.AuthenticationError):
+        return None
+    with connection:
+        request = {"argv": args, "cwd": os.getcwd(), "stdin_isatty": sys.stdin is None or sys.stdin.isatty()}
+        connection.send_bytes(json.dumps(request).encode("utf-8"))
+        while True:
+            message = connection.recv_bytes()
+            if message[:1] == b"o":
+                sys.stdout.write(message[1:].decode("utf-8"))
+                sys.stdout.flush()
+            elif message[:1] == b"i":
+                connection.send_bytes(sys.stdin.buffer.read1(int(message[1:])))
+            else:
+                return int(message[1:])
 
 def main(args):
-    logging.getLogger().setLevel(logging.WARN)
-    #logging.basicConfig(format='[%(asctime)s] [%(levelname)7s] [%(funcName)-20.20s] [%(lineno)03d] - %(message)s')
-    logging.basicConfig(format='[%(levelname)7s] [%(funcName)-10.10s] [%(lineno)03d] - %(message)s')
+    global _log_format
+    #_log_format = '[%(asctime)s] [%(levelname)7s] [%(funcName)-20.20s] [%(lineno)03d] - %(message)s'
+    _log_format = '[%(levelname)7s] [%(funcName)-10.10s] [%(lineno)03d] - %(message)s'
+    if len(args) > 1 and args[1] == "--server":
+        try:
+            directory = server_directory()
+        except OSError as err:
+            log().error("server: %s", err)
+            sys.exit(1)
+        sys.exit(VSJumpToLineServer(directory).serve_forever())
+    if len(args) > 1 and args[1] == "--client":
+        args = args[:1] + args[2:]
+        exit_code = run_client(args)
+        if exit_code is not None:
+            sys.exit(exit_code)
 
     jtol = VSJumpToLine(args)
     jtol.print_output()
@@ -590,4 +2168,8 @@ def main(args):
     sys.exit(jtol.EXIT_SUCCESS)
 
 if __name__ == "__main__":
+    # Needed for the worker processes of the jobs option in a frozen executable
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     main(sys.argv)
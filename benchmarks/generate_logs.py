@@ -0,0 +1,120 @@
+"""
+Generator of synthetic tool output for the benchmarks of VSJumpToLine.
+
+The logs are deterministic (fixed seed) and mix the formats VSJumpToLine supports:
+GCC (with 'In function' context and caret lines), Doxygen, IAR Embedded Workbench,
+BullseyeCoverage, cmocka and Unity, plus the build noise in between.
+
+Usage: python benchmarks/generate_logs.py <file> <size> [seed]
+       size in bytes, the suffixes k, M and G are allowed (e.g. 100M)
+"""
+import sys
+import random
+
+NOISE = (
+    "gcc -c -O2 -Wall -Wextra -Isrc/include -o build/{module}/{name}.o src/{module}/{name}.c",
+    "make[2]: Entering directory '/home/build/project/src/{module}'",
+    "make[2]: Leaving directory '/home/build/project/src/{module}'",
+    "[ {percent:3}%] Building C object src/{module}/CMakeFiles/{module}.dir/{name}.c.o",
+    "[ RUN      ] test_{function}",
+    "[       OK ] test_{function}",
+    "Generating documentation for src/{module}/{name}.h...",
+)
+
+def gcc(rnd, values):
+    lines = ["src/{module}/{name}.c: In function '{function}':".format(**values)]
+    kind = rnd.randrange(4)
+    if kind == 0:
+        lines.append("src/{module}/{name}.c:{line}:{column}: warning: unused parameter 'arg{index}' [-Wunused-parameter]".format(**values))
+    elif kind == 1:
+        lines.append("src/{module}/{name}.c:{line}:{column}: warning: unused variable 'tmp{index}' [-Wunused-variable]".format(**values))
+    elif kind == 2:
+        lines.append("src/{module}/{name}.c:{line}:{column}: error: 'count{index}' undeclared (first use in this function)".format(**values))
+    else:
+        lines.append("src/{module}/{name}.c:{line}:{column}: note: each undeclared identifier is reported only once".format(**values))
+    lines.append("     int tmp{index} = arg{index};".format(**values))
+    lines.append(" " * (values["column"] - 1) + "^~~~")
+    return lines
+
+def gcc_linker(rnd, values):
+    return ["build/{module}/{name}.o: In function `{function}':".format(**values),
+            "{name}.c:(.text+0x{index:x}): undefined reference to `{function}_init'".format(**values)]
+
+def doxygen(rnd, values):
+    return ["/home/build/project/src/{module}/{name}.h:{line}: warning: Member {function} (function) of file {name}.h is not documented.".format(**values)]
+
+def iar(rnd, values):
+    return ["C:\\project\\src\\{module}\\{name}.c({line}) : Warning[Pe177]: variable \"tmp{index}\" was declared but never referenced".format(**values)]
+
+def bullseye(rnd, values):
+    return ["\"C:/project/src/{module}/{name}.c\",{line}  Warning[Pe550]: variable \"arg{index}\" was set but never used".format(**values)]
+
+def cmocka(rnd, values):
+    return ["[   LINE   ] --- test_{name}.c:{line}: error: Failure!".format(**values),
+            "[  FAILED  ] test_{function}".format(**values)]
+
+def unity(rnd, values):
+    return ["test/test_{name}.c:{line}:test_{function}:FAIL: Expected {index} Was 0".format(**values)]
+
+# (generator, weight), GCC dominates like in a real build log
+MESSAGES = ((gcc, 8), (gcc_linker, 1), (doxygen, 3), (iar, 2), (bullseye, 1), (cmocka, 1), (unity, 1))
+
+def parse_size(size):
+    """
+    Convert a size like '100M' into bytes.
+    """
+    factors = {"k": 1000, "m": 1000 ** 2, "g": 1000 ** 3}
+    if size[-1:].lower() in factors:
+        return int(float(size[:-1]) * factors[size[-1:].lower()])
+    return int(size)
+
+def generate_lines(seed=0, noise=4, modules=50, names=400):
+    """
+    Endless generator of log lines, about one message per 'noise' lines of build output (no build output for 0).
+    The number of modules and file names is limited, so messages and paths repeat like in a real log.
+    """
+    rnd = random.Random(seed)
+    generators = [generator for generator, weight in MESSAGES for _ in range(weight)]
+    while True:
+        values = {
+            "module": "module{}".format(rnd.randrange(modules)),
+            "name": "file{}".format(rnd.randrange(names)),
+            "function": "function{}".format(rnd.randrange(2000)),
+            "line": rnd.randrange(1, 5000),
+            "column": rnd.randrange(1, 40),
+            "index": rnd.randrange(100),
+            "percent": rnd.randrange(101),
+        }
+        for _ in range(rnd.randrange(noise * 2) if noise else 0):
+            yield rnd.choice(NOISE).format(**values)
+        yield from rnd.choice(generators)(rnd, values)
+
+def generate(filename, size, seed=0, noise=4):
+    """
+    Write a log of (at least) 'size' bytes, return the number of lines.
+    """
+    cnt_lines = 0
+    written = 0
+    batch = []
+    with open(filename, "w", encoding="utf-8", newline="\n") as file_log:
+        for line in generate_lines(seed, noise):
+            batch.append(line)
+            written += len(line) + 1
+            if len(batch) == 10000 or written >= size:
+                file_log.write("\n".join(batch) + "\n")
+                cnt_lines += len(batch)
+                batch = []
+                if written >= size:
+                    break
+    return cnt_lines
+
+def main(args):
+    if len(args) < 3:
+        print(__doc__)
+        sys.exit(2)
+    seed = int(args[3]) if len(args) > 3 else 0
+    cnt_lines = generate(args[1], parse_size(args[2]), seed)
+    print("{}: {} lines".format(args[1], cnt_lines))
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,68 @@
+"""
+Import time benchmark of VSJumpToLine (python -X importtime).
+
+Runs VSJumpToLine on a small log a few times and prints the modules with the
+largest cumulative import time (best of all runs) and the total start time.
+
+Usage: python benchmarks/importtime.py [runs] [top]
+"""
+import sys
+import os
+import subprocess
+import tempfile
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "VSJumpToLine.py")
+
+SMALL_LOG = """\
+hello_world.c: In function 'main':
+hello_world.c:5:13: note: #pragma message: some message1
+hello_world.c:8:10: error: redeclaration of 'unused_var2' with no linkage
+hello_world.c:10:5: warning: format '%u' expects a matching 'unsigned int' argument [-Wformat=]
+hello_world.c:6:10: warning: unused variable 'unused_var1' [-Wunused-variable]
+"""
+
+def run_importtime(directory):
+    """
+    Run the script once, return {module: cumulative import time [us]} of the top level imports and the wall time [s].
+    """
+    time_start = time.perf_counter()
+    # VSJumpToLine expects the input file relative to the working directory
+    result = subprocess.run([sys.executable, "-X", "importtime", SCRIPT, "-f", "tool_output.txt"], cwd=directory,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    wall_time = time.perf_counter() - time_start
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Only modules imported directly (not indented), their time includes the nested imports
+        if not name.startswith("  "):
+            modules[name.strip()] = int(cumulative)
+    return modules, wall_time
+
+def main(args):
+    runs = int(args[1]) if len(args) > 1 else 5
+    top = int(args[2]) if len(args) > 2 else 15
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "tool_output.txt"), "w") as file_log:
+            file_log.write(SMALL_LOG)
+
+        best = {}
+        wall_times = []
+        for _ in range(runs):
+            modules, wall_time = run_importtime(directory)
+            wall_times.append(wall_time)
+            for name, cumulative in modules.items():
+                best[name] = min(best.get(name, cumulative), cumulative)
+
+    print("{:>12}  {}".format("import [us]", "module"))
+    for name, cumulative in sorted(best.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print("{:>12}  {}".format(cumulative, name))
+    print("")
+    print("modules: {}, sum of imports: {:.1f} ms, wall time (best of {}): {:.1f} ms".format(
+        len(best), sum(best.values()) / 1000, runs, min(wall_times) * 1000))
+
+if __name__ == "__main__":
+    main(sys.argv)
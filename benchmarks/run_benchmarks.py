@@ -0,0 +1,293 @@
+"""
+Throughput benchmark of the full VSJumpToLine pipeline.
+
+Generates synthetic logs (see generate_logs.py) of the requested sizes, runs VSJumpToLine
+on each of them in a fresh process and reports lines/sec, peak RSS and the time of the phases
+(import, processing of the input file, output). The logs are kept in the log directory,
+so they are only generated once.
+
+Scenarios:
+  pipeline : the whole run (default)
+  classify : only the severity classification of all lines, lines/sec of the classifier
+  output   : the output phase of a log without build output (about 100k messages for 10M),
+             stdout is a pipe like in the IDE
+
+Usage: python benchmarks/run_benchmarks.py [options] [-- <VSJumpToLine options>]
+  -b --scenario <name>  : Scenario, default - pipeline
+  -s --sizes <sizes>    : Comma separated log sizes, default - 1M,100M (1G is supported as well)
+  -r --repeat <n>       : Runs per size, the best run is reported, default - 3
+  -n --noise <n>        : About one message per <n> lines of build output, default - 4 (0 for the output scenario)
+  -l --logs <dir>       : Directory of the generated logs, default - <temp>/VSJumpToLine-benchmarks
+  -x --script <file>    : VSJumpToLine.py to measure, default - the one of this repository
+  -g --rev <revision>   : Measure VSJumpToLine.py of a git revision (before/after comparison of a change)
+  -o --save <file>      : Store the results as JSON
+  -c --compare <file>   : Compare with stored results, report runs slower by more than 10%
+Example: python benchmarks/run_benchmarks.py -s 1M,100M -c baseline.json -- -m3 -s
+         python benchmarks/run_benchmarks.py -b output -s 10M -- -m3 -b exit
+Before/after of the classifier:
+         python benchmarks/run_benchmarks.py -b classify -s 100M -g HEAD~1 -o before.json
+         python benchmarks/run_benchmarks.py -b classify -s 100M -c before.json
+Before/after of the throughput of a message dense log:
+         python benchmarks/run_benchmarks.py -s 10M -n 0 -g HEAD~1 -o before.json -- -q
+         python benchmarks/run_benchmarks.py -s 10M -n 0 -c before.json -- -q
+"""
+import sys
+import os
+import getopt
+import json
+import subprocess
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, the peak RSS is not reported there
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import generate_logs
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SLOWER_THRESHOLD = 1.10
+SCENARIOS = ("pipeline", "classify", "output")
+# Time compared with stored results
+SCENARIO_TIMES = {"pipeline": "total", "classify": "process", "output": "output"}
+DEFAULT_NOISE = 4
+
+def peak_rss():
+    """
+    Peak resident set size of this process in bytes (None if unknown).
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def severity_classifier(VSJumpToLine):
+    """
+    Return the severity classification of a VSJumpToLine module and if it expects undecoded lines.
+    Former versions have a private method instead of the line parser.
+    """
+    if hasattr(VSJumpToLine, "LineParser"):
+        return VSJumpToLine.LineParser().match_severity, True
+    instance = VSJumpToLine.VSJumpToLine.__new__(VSJumpToLine.VSJumpToLine)
+    match_severity = getattr(instance, "_VSJumpToLine__match_severity")
+    try:
+        match_severity(b"main.c:1:2: warning: test")
+        return match_severity, True
+    except TypeError:
+        return match_severity, False
+
+def run_classify(filename, script_dir):
+    """
+    Child process: classify all lines of a file and print the measurements as JSON.
+    """
+    time_start = time.perf_counter()
+    sys.path.insert(0, script_dir)
+    import VSJumpToLine
+    time_import = time.perf_counter()
+
+    match_severity, undecoded = severity_classifier(VSJumpToLine)
+    with open(filename, "rb") as file_log:
+        lines = file_log.read().splitlines()
+    if not undecoded:
+        lines = [line.decode("utf-8") for line in lines]
+    time_classify = time.perf_counter()
+    messages = sum(1 for line in lines if match_severity(line))
+    time_end = time.perf_counter()
+
+    json.dump({
+        "lines": len(lines),
+        "messages": messages,
+        "import": time_import - time_start,
+        "process": time_end - time_classify,
+        "output": 0.0,
+        "total": time_end - time_start,
+        "peak_rss": peak_rss(),
+    }, sys.stdout)
+
+def drain_pipe(fd):
+    """
+    Read a pipe until it is closed, the reader of the output.
+    """
+    while os.read(fd, 65536):
+        pass
+
+def run_single(filename, script_dir, options, piped=False):
+    """
+    Child process: run VSJumpToLine on a single file and print the measurements as JSON.
+    With 'piped' the output is written to a pipe instead of the null device.
+    """
+    time_start = time.perf_counter()
+    sys.path.insert(0, script_dir)
+    import VSJumpToLine
+    time_import = time.perf_counter()
+
+    stdout = sys.stdout
+    if piped:
+        import threading
+        fd_read, fd_write = os.pipe()
+        reader = threading.Thread(target=drain_pipe, args=(fd_read,))
+        reader.start()
+        output = os.fdopen(fd_write, "w")
+    else:
+        output = open(os.devnull, "w")
+    with output:
+        sys.stdout = output
+        jtol = VSJumpToLine.VSJumpToLine(["VSJumpToLine.py", "-f", filename] + options)
+        time_process = time.perf_counter()
+        jtol.print_output()
+        sys.stdout.flush()
+        time_output = time.perf_counter()
+        sys.stdout = stdout
+    if piped:
+        reader.join()
+        os.close(fd_read)
+
+    json.dump({
+        "lines": jtol.cnt_lines,
+        "messages": jtol.cnt_errors + jtol.cnt_warnings + jtol.cnt_notes + jtol.cnt_infos,
+        "import": time_import - time_start,
+        "process": time_process - time_import,
+        "output": time_output - time_process,
+        "total": time_output - time_start,
+        "peak_rss": peak_rss(),
+    }, sys.stdout)
+
+def log_filename(size, noise):
+    if noise != DEFAULT_NOISE:
+        return "synthetic_{}_noise{}.txt".format(size, noise)
+    return "synthetic_{}.txt".format(size)
+
+def generate_log(log_dir, size, noise):
+    """
+    Generate the log of a size and build output density if not yet done.
+    """
+    path = os.path.join(log_dir, log_filename(size, noise))
+    if not os.path.exists(path):
+        print("generating: <{}>".format(path))
+        sys.stdout.flush()
+        generate_logs.generate(path + ".tmp", generate_logs.parse_size(size), noise=noise)
+        os.replace(path + ".tmp", path)
+
+def run_size(log_dir, size, noise, scenario, script_dir, options):
+    """
+    Run the scenario on the log of a size in a fresh process.
+    """
+    filename = log_filename(size, noise)
+    # VSJumpToLine expects the input file relative to the working directory
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--" + scenario, filename, script_dir] + options,
+                            cwd=log_dir, stdout=subprocess.PIPE, text=True, check=True)
+    return json.loads(result.stdout)
+
+def extract_revision(revision, directory):
+    """
+    Write VSJumpToLine.py of a git revision into the directory.
+    """
+    script = subprocess.run(["git", "show", "{}:VSJumpToLine.py".format(revision)], cwd=REPO_DIR,
+                            stdout=subprocess.PIPE, check=True).stdout
+    with open(os.path.join(directory, "VSJumpToLine.py"), "wb") as file_script:
+        file_script.write(script)
+
+def format_rss(rss):
+    return "n/a" if rss is None else "{:.1f} MB".format(rss / 1000 ** 2)
+
+def main(args):
+    if len(args) > 1 and args[1] == "--pipeline":
+        run_single(args[2], args[3], args[4:])
+        return
+    if len(args) > 1 and args[1] == "--output":
+        run_single(args[2], args[3], args[4:], piped=True)
+        return
+    if len(args) > 1 and args[1] == "--classify":
+        run_classify(args[2], args[3])
+        return
+
+    scenario = "pipeline"
+    sizes = ["1M", "100M"]
+    repeat = 3
+    noise = None
+    log_dir = os.path.join(tempfile.gettempdir(), "VSJumpToLine-benchmarks")
+    script_dir = REPO_DIR
+    revision = ""
+    save_file = ""
+    compare_file = ""
+    try:
+        opts, options = getopt.getopt(args[1:], "h?b:s:r:n:l:x:g:o:c:", ["help", "scenario=", "sizes=", "repeat=", "noise=", "logs=", "script=", "rev=", "save=", "compare="])
+    except getopt.GetoptError as err:
+        print(err)
+        print(__doc__)
+        sys.exit(2)
+    for opt, arg in opts:
+        if opt in ("-h", "-?", "--help"):
+            print(__doc__)
+            sys.exit(0)
+        elif opt in ("-b", "--scenario"):
+            if arg not in SCENARIOS:
+                print("unknown scenario: <{}>, one of: {}".format(arg, ", ".join(SCENARIOS)))
+                sys.exit(2)
+            scenario = arg
+        elif opt in ("-s", "--sizes"):
+            sizes = arg.split(",")
+        elif opt in ("-r", "--repeat"):
+            repeat = int(arg)
+        elif opt in ("-n", "--noise"):
+            noise = int(arg)
+        elif opt in ("-l", "--logs"):
+            log_dir = arg
+        elif opt in ("-x", "--script"):
+            script_dir = os.path.dirname(os.path.abspath(arg))
+        elif opt in ("-g", "--rev"):
+            revision = arg
+        elif opt in ("-o", "--save"):
+            save_file = arg
+        elif opt in ("-c", "--compare"):
+            compare_file = arg
+    if noise is None:
+        noise = 0 if scenario == "output" else DEFAULT_NOISE
+    os.makedirs(log_dir, exist_ok=True)
+    for size in sizes:
+        generate_log(log_dir, size, noise)
+    if revision:
+        script_dir = os.path.join(log_dir, "revision")
+        os.makedirs(script_dir, exist_ok=True)
+        extract_revision(revision, script_dir)
+
+    baseline = {}
+    if compare_file:
+        with open(compare_file, "r", encoding="utf-8") as file_baseline:
+            baseline = json.load(file_baseline)["results"]
+
+    results = {}
+    print("{:>6} {:>10} {:>10} {:>12} {:>8} {:>9} {:>8} {:>9} {:>10}".format(
+        "size", "lines", "messages", "lines/s", "import", "process", "output", "total", "peak RSS"))
+    for size in sizes:
+        runs = [run_size(log_dir, size, noise, scenario, script_dir, options) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run[SCENARIO_TIMES[scenario]])
+        best["lines_per_second"] = best["lines"] / best["process"] if best["process"] else 0
+        results[size] = best
+        print("{:>6} {:>10} {:>10} {:>12.0f} {:>7.3f}s {:>8.3f}s {:>7.3f}s {:>8.3f}s {:>10}".format(
+            size, best["lines"], best["messages"], best["lines_per_second"],
+            best["import"], best["process"], best["output"], best["total"], format_rss(best["peak_rss"])))
+
+    slower = []
+    time_key = SCENARIO_TIMES[scenario]
+    for size, result in results.items():
+        if size in baseline and result[time_key] > baseline[size][time_key] * SLOWER_THRESHOLD:
+            slower.append("{}: {:.3f}s (baseline {:.3f}s)".format(size, result[time_key], baseline[size][time_key]))
+    if compare_file:
+        print("")
+        print("slower than <{}>: {}".format(compare_file, ", ".join(slower) if slower else "none"))
+
+    if save_file:
+        with open(save_file, "w", encoding="utf-8") as file_results:
+            json.dump({"scenario": scenario, "noise": noise, "revision": revision, "options": options, "python": sys.version.split()[0],
+                       "results": results}, file_results, indent=2)
+
+    if slower:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,159 @@
+"""
+Tests of the processing modes which must give the same output as the plain processing of the file:
+memory mapped scanning (-r), parallel parsing (-j) and continuing at a checkpoint (-k).
+The logs are generated randomly (with fixed seeds), the chunk and range sizes are made tiny so the
+multi line context crosses many chunk and range boundaries.
+
+Usage: python -m unittest discover tests (or pytest)
+"""
+import sys
+import os
+import io
+import re
+import random
+import contextlib
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import VSJumpToLine
+
+SEEDS = range(5)
+MULTI_LINE_OPTIONS = ([], ["-m1"], ["-m2"], ["-m3"], ["-m3", "-s"], ["-m2", "-s"])
+
+# Few different names and numbers, so there are identical messages to suppress
+MESSAGES = (
+    "src/file{n}.c:{line}:{column}: {severity}: message {n}",
+    "file{n}.h:{line}: {severity}: unused parameter 'state' [-Wunused-parameter]",
+    "c:\\test\\file{n}.h({line}) : {severity_iar}[Pe{n}]: message {n}",
+    "\"c:/file{n}.c\",{line}  {severity_iar}[Pe177]: variable declared but never referenced",
+    "[   LINE   ] --- testcases{n}.c:{line}: error: Failure!",
+    "main.c:(.text+0x1c): undefined reference to `bar{n}(1): x'",
+    "ld: error: cannot open output file foo{n}(3): Permission denied",
+    "test_x.c:{line}:test_y:FAIL: Expected {n} Was 2",
+)
+LINES = (
+    "file{n}.c: In function 'main{n}':",
+    "     char unused_var{n};",
+    "          ^",
+    "make[1]: Entering directory '/x{n}'",
+    "gcc -c file{n}.c",
+    "",
+    "   ",
+)
+
+def generate_log(seed, cnt_lines=300):
+    """
+    Return a random log (bytes) with messages, multi line context and noise, partly with CRLF line endings.
+    """
+    rnd = random.Random(seed)
+    lines = []
+    for _ in range(cnt_lines):
+        values = {
+            "n": rnd.randrange(4),
+            "line": rnd.randrange(1, 20),
+            "column": rnd.randrange(1, 5),
+            "severity": rnd.choice(("error", "warning", "note")),
+            "severity_iar": rnd.choice(("Error", "Warning", "Note")),
+        }
+        template = rnd.choice(MESSAGES) if rnd.random() < 0.4 else rnd.choice(LINES)
+        lines.append(template.format(**values) + rnd.choice(("\n", "\n", "\r\n")))
+    # Sometimes without line end at the end of the file
+    if rnd.random() < 0.5:
+        lines[-1] = lines[-1].rstrip("\r\n")
+    return "".join(lines).encode("utf-8")
+
+class TestEquivalence(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.chunk_size = VSJumpToLine.LineParser.chunk_size
+        self.range_size = VSJumpToLine.VSJumpToLine.range_size
+
+    def tearDown(self):
+        VSJumpToLine.LineParser.chunk_size = self.chunk_size
+        VSJumpToLine.VSJumpToLine.range_size = self.range_size
+        self.directory.cleanup()
+
+    def write_log(self, filename, data):
+        with open(os.path.join(self.directory.name, filename), "wb") as file_log:
+            file_log.write(data)
+
+    def run_output(self, options, files=("tool_output.txt",), chunk_size=None):
+        """
+        Return the output lines of a run (without the time), optionally with another chunk size.
+        """
+        # The input files are expected relative to the working directory
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        output = io.StringIO()
+        try:
+            if chunk_size:
+                VSJumpToLine.LineParser.chunk_size = chunk_size
+            with contextlib.redirect_stdout(output):
+                args = ["VSJumpToLine.py", "-q", "-e", "utf-8"]
+                for filename in files:
+                    args += ["-f", filename]
+                jtol = VSJumpToLine.VSJumpToLine(args + options)
+                jtol.print_output()
+        finally:
+            VSJumpToLine.LineParser.chunk_size = self.chunk_size
+            os.chdir(cwd)
+        return re.sub(r"time: [0-9.]+s", "time: -", output.getvalue()).splitlines()
+
+    def test_mmap(self):
+        for seed in SEEDS:
+            self.write_log("tool_output.txt", generate_log(seed))
+            for options in MULTI_LINE_OPTIONS:
+                expected = self.run_output(options)
+                for chunk_size in (1, 7, 64):
+                    with self.subTest(seed=seed, options=options, chunk_size=chunk_size):
+                        self.assertEqual(self.run_output(options + ["-r"], chunk_size=chunk_size), expected)
+                        self.assertEqual(self.run_output(options, chunk_size=chunk_size), expected)
+
+    def test_jobs(self):
+        for seed in SEEDS:
+            self.write_log("tool_output.txt", generate_log(seed))
+            for options in MULTI_LINE_OPTIONS:
+                expected = self.run_output(options)
+                for range_size in (100, 1000):
+                    VSJumpToLine.VSJumpToLine.range_size = range_size
+                    with self.subTest(seed=seed, options=options, range_size=range_size):
+                        self.assertEqual(self.run_output(options + ["-j", "3"], chunk_size=7), expected)
+
+    def test_jobs_files(self):
+        # The messages of all files are grouped and suppressed together, the context ends with each file
+        VSJumpToLine.VSJumpToLine.range_size = 300
+        files = ("tool_output1.txt", "tool_output2.txt", "tool_output3.txt")
+        for seed in SEEDS:
+            for index, filename in enumerate(files):
+                self.write_log(filename, generate_log(seed * len(files) + index, 100))
+            for options in MULTI_LINE_OPTIONS:
+                with self.subTest(seed=seed, options=options):
+                    self.assertEqual(self.run_output(options + ["-j", "2"], files), self.run_output(options, files))
+
+    def test_checkpoint(self):
+        # The file grows between the runs, also in the middle of a line
+        for seed in SEEDS:
+            data = generate_log(seed)
+            sizes = sorted(random.Random(seed).sample(range(1, len(data)), 4)) + [len(data)]
+            for options in MULTI_LINE_OPTIONS:
+                for columnar in ([], ["--columnar"]):
+                    checkpoint = os.path.join(self.directory.name, "checkpoint.json")
+                    if os.path.exists(checkpoint):
+                        os.remove(checkpoint)
+                    for size in sizes:
+                        self.write_log("tool_output.txt", data[:size])
+                        with self.subTest(seed=seed, options=options, columnar=columnar, size=size):
+                            self.assertEqual(self.run_output(options + columnar + ["-k", checkpoint]),
+                                             self.run_output(options + columnar))
+
+    def test_checkpoint_changed(self):
+        # A file which has been written again from the beginning is processed completely
+        checkpoint = os.path.join(self.directory.name, "checkpoint.json")
+        self.write_log("tool_output.txt", generate_log(0))
+        self.run_output(["-m3", "-s", "-k", checkpoint])
+        self.write_log("tool_output.txt", generate_log(1) + generate_log(2))
+        self.assertEqual(self.run_output(["-m3", "-s", "-k", checkpoint]), self.run_output(["-m3", "-s"]))
+
+if __name__ == "__main__":
+    unittest.main()
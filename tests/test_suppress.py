@@ -0,0 +1,99 @@
+"""
+Tests of the suppression of identical messages (-s), the counts are the ones of the original
+implementation (linear search in the result list).
+
+Usage: python -m unittest discover tests (or pytest)
+"""
+import sys
+import os
+import io
+import contextlib
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import VSJumpToLine
+
+TOOL_OUTPUT = """\
+make[1]: Entering directory '/x'
+hello_world.c: In function 'main':
+hello_world.c:5:13: note: #pragma message: some message1
+     #pragma message "some message1"
+             ^
+hello_world.c:8:10: error: redeclaration of 'unused_var2' with no linkage
+     char unused_var2;
+          ^
+hello_world.c:8:10: error: redeclaration of 'unused_var2' with no linkage
+     char unused_var2;
+          ^
+hello_world.c:5:13: note: #pragma message: some message1
+     #pragma message "some message1"
+             ^
+hello_world.c:8:10: warning: unused variable 'unused_var2' [-Wunused-variable]
+     char unused_var2;
+          ^
+hello_world.c:8:10: warning: unused variable 'unused_var2' [-Wunused-variable]
+     char unused_var2;
+          ^
+hello_world.c:6:10: warning: unused variable 'unused_var1' [-Wunused-variable]
+     char unused_var1;
+          ^
+util.h: In function 'foo':
+util.h:124: warning: unused parameter 'state' [-Wunused-parameter]
+util.h:124: warning: unused parameter 'state' [-Wunused-parameter]
+[   LINE   ] --- testcases.c:9: error: Failure!
+[   LINE   ] --- testcases.c:9: error: Failure!
+"c:/testfile.c",276  Warning[Pe177]: variable declared but never referenced
+"c:/testfile.c",276  Warning[Pe177]: variable declared but never referenced
+c:\\test\\testfile.h(44) : Note[Pe1105]: something note
+c:\\test\\testfile.h(44) : Note[Pe1105]: something note
+main.o: In function `main':
+main.c:(.text+0x1c): undefined reference to `bar'
+main.c:(.text+0x1c): undefined reference to `bar'
+test_x.c:42:test_y:FAIL: Expected 1 Was 2
+"""
+
+# (errors, suppressed errors, warnings, suppressed warnings, notes, suppressed notes)
+EXPECTED_SUPPRESS = (3, 3, 5, 3, 2, 2)
+EXPECTED_NO_SUPPRESS = (6, 0, 8, 0, 4, 0)
+
+class TestSuppress(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.directory.name, "tool_output.txt"), "w", encoding="utf-8") as file_log:
+            file_log.write(TOOL_OUTPUT)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_counts(self, options):
+        # The input file is expected relative to the working directory
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                jtol = VSJumpToLine.VSJumpToLine(["VSJumpToLine.py", "-f", "tool_output.txt", "-e", "utf-8"] + options)
+                jtol.print_output()
+        finally:
+            os.chdir(cwd)
+        return (jtol.cnt_errors, jtol.cnt_suppressed_errors, jtol.cnt_warnings, jtol.cnt_suppressed_warnings,
+                jtol.cnt_notes, jtol.cnt_suppressed_notes)
+
+    def test_suppress(self):
+        self.assertEqual(self.run_counts(["-s"]), EXPECTED_SUPPRESS)
+
+    def test_suppress_multi_line(self):
+        for multi_line in ("1", "2", "3"):
+            with self.subTest(multi_line=multi_line):
+                self.assertEqual(self.run_counts(["-s", "-m", multi_line]), EXPECTED_SUPPRESS)
+
+    def test_suppress_stream_and_spill(self):
+        for mode in ("-t", "-g"):
+            with self.subTest(mode=mode):
+                self.assertEqual(self.run_counts(["-s", "-m3", mode]), EXPECTED_SUPPRESS)
+
+    def test_no_suppress(self):
+        self.assertEqual(self.run_counts(["-m3"]), EXPECTED_NO_SUPPRESS)
+
+if __name__ == "__main__":
+    unittest.main()